@@ -10,6 +10,7 @@ Usage:
 """
 
 import os
+import importlib.util
 import argparse
 import pandas as pd
 import numpy as np
@@ -24,6 +25,10 @@ import re
 # Constants and settings
 FIG_SIZE = (16, 10)  # Default figure size
 DPI = 300  # Resolution for saved images
+# Multithreaded Arrow CSV parser when pyarrow is installed; timestamps are
+# read as plain strings (Arrow would otherwise turn HH:MM:SS into time objects)
+CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') is not None else 'c'
+CSV_DTYPES = {'timestamp': str}
 
 # Team colors for visualization
 TEAM_COLORS = {
@@ -104,11 +109,11 @@ def load_lap_data(meeting_key, session_key):
     
     try:
         print(f"Loading lap time data from: {lap_file}")
-        df = pd.read_csv(lap_file)
+        df = pd.read_csv(lap_file, engine=CSV_ENGINE, dtype=CSV_DTYPES)
         
-        # Convert driver numbers to strings for consistency
+        # Driver numbers as string categories: consistent and cheap to group/compare
         if 'driver_number' in df.columns:
-            df['driver_number'] = df['driver_number'].astype(str)
+            df['driver_number'] = df['driver_number'].astype(str).astype('category')
         
         # Sort by timestamp if available
         if 'timestamp' in df.columns:
@@ -118,43 +123,32 @@ def load_lap_data(meeting_key, session_key):
         
         # Process lap times to seconds if in string format
         if 'lap_time' in df.columns and isinstance(df['lap_time'].iloc[0], str):
-            df['lap_seconds'] = df['lap_time'].apply(convert_lap_time_to_seconds)
+            df['lap_seconds'] = convert_lap_times_to_seconds(df['lap_time'])
         
         return df
     except Exception as e:
         print(f"Error loading lap time data: {str(e)}")
         return None
 
-def convert_lap_time_to_seconds(lap_time):
+def convert_lap_times_to_seconds(lap_times):
     """
-    Convert lap time from string format (MM:SS.sss) to seconds.
+    Convert a whole Series of lap times (H:MM:SS.sss, MM:SS.sss or SS.sss) to seconds at once.
     
     Args:
-        lap_time: Lap time string (e.g., "1:30.456")
+        lap_times: Series of lap time strings
         
     Returns:
-        float: Lap time in seconds
+        pd.Series: Lap times in seconds (NaN where conversion failed)
     """
-    try:
-        if pd.isna(lap_time) or lap_time == "":
-            return None
-        
-        # If already a number, return as is
-        if isinstance(lap_time, (int, float)):
-            return float(lap_time)
-        
-        # Format: MM:SS.sss
-        if ":" in lap_time:
-            parts = lap_time.split(":")
-            minutes = float(parts[0])
-            seconds = float(parts[1])
-            return minutes * 60 + seconds
-        
-        # Format: SS.sss
-        return float(lap_time)
-    except:
-        print(f"Warning: Could not convert lap time '{lap_time}' to seconds")
-        return None
+    # Parse each distinct lap time string once and gather the results back
+    codes, uniques = pd.factorize(lap_times)
+    parts = pd.Series(uniques, dtype=object).astype(str).str.strip().str.extract(r'^(?:(?:(\d+):)?(\d+):)?(\d+(?:\.\d+)?)$')
+    hours = pd.to_numeric(parts[0], errors='coerce').fillna(0)
+    minutes = pd.to_numeric(parts[1], errors='coerce').fillna(0)
+    seconds = pd.to_numeric(parts[2], errors='coerce')
+    parsed = (hours * 3600 + minutes * 60 + seconds).to_numpy(dtype=np.float64)
+    values = np.where(codes >= 0, parsed[codes] if len(parsed) else np.nan, np.nan)
+    return pd.Series(values, index=lap_times.index)
 
 def load_tire_data(meeting_key, session_key):
     """
@@ -253,12 +247,12 @@ def process_lap_data(lap_df, tire_df=None, driver_info=None, selected_driver=Non
     
     # Make sure we have lap time in seconds
     if 'lap_seconds' not in lap_df.columns:
-        lap_df['lap_seconds'] = lap_df['lap_time'].apply(convert_lap_time_to_seconds)
+        lap_df['lap_seconds'] = convert_lap_times_to_seconds(lap_df['lap_time'])
     
     # Add lap number if not present
     if 'lap_number' not in lap_df.columns:
         # Group by driver and create sequential lap numbers
-        lap_df['lap_number'] = lap_df.groupby('driver_number').cumcount() + 1
+        lap_df['lap_number'] = lap_df.groupby('driver_number', observed=True).cumcount() + 1
     
     # Get unique driver numbers
     all_drivers = sorted(lap_df['driver_number'].unique())
@@ -303,6 +297,14 @@ def process_lap_data(lap_df, tire_df=None, driver_info=None, selected_driver=Non
         }
     }
     
+    # Keep only the drivers being analyzed (one membership pass over the category codes)
+    analyzed_laps = lap_df[lap_df['driver_number'].isin(drivers_to_analyze)]
+    
+    # Sort by lap number once and split the laps by driver (groups keep that order)
+    laps_by_driver = dict(tuple(
+        analyzed_laps.sort_values('lap_number', kind='stable').groupby('driver_number', sort=False, observed=True)
+    ))
+    
     # Process each driver's lap data
     for driver in drivers_to_analyze:
         driver_name = f"Driver #{driver}"
@@ -325,15 +327,12 @@ def process_lap_data(lap_df, tire_df=None, driver_info=None, selected_driver=Non
                     team_color = TEAM_COLORS.get(team_name, team_color)
         
         # Get driver's lap data
-        driver_laps = lap_df[lap_df['driver_number'] == driver].copy()
+        driver_laps = laps_by_driver.get(driver)
         
         # Skip if no lap data for this driver
-        if driver_laps.empty:
+        if driver_laps is None or driver_laps.empty:
             continue
         
-        # Sort by lap number
-        driver_laps = driver_laps.sort_values('lap_number')
-        
         # Filter to fastest laps only if requested
         if fastest_only:
             # Find the fastest lap
@@ -765,19 +764,22 @@ def create_stint_analysis(lap_data, race_name, session_name, output_path, select
         
         # If there are enough laps, fit a trend line
         if len(stint_laps) >= 3:
-            z = np.polyfit(stint_lap_offset, stint_times, 1)
-            p = np.poly1d(z)
+            # Closed-form least squares for a straight line (no Vandermonde/lstsq needed)
+            x = np.asarray(stint_lap_offset, dtype=np.float64)
+            y = np.asarray(stint_times, dtype=np.float64)
+            dx = x - x.mean()
+            slope = (dx * (y - y.mean())).sum() / (dx * dx).sum()
+            intercept = y.mean() - slope * x.mean()
             
             # Calculate trend line values
             trend_x = np.linspace(start_lap, end_lap, 100)
             trend_offset = np.linspace(1, end_lap - start_lap + 1, 100)
-            trend_y = p(trend_offset)
+            trend_y = slope * trend_offset + intercept
             
             # Plot trend line
             plt.plot(trend_x, trend_y, '--', color=color, alpha=0.6)
             
             # Add slope label (tire degradation rate)
-            slope = z[0]
             slope_text = f"+{slope:.3f} sec/lap" if slope > 0 else f"{slope:.3f} sec/lap"
             plt.text(start_lap + (end_lap - start_lap)/2, min(stint_times), 
                     f"Deg: {slope_text}", ha='center', va='bottom', color=color,
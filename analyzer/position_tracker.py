@@ -10,6 +10,7 @@ Usage:
 """
 
 import os
+import importlib.util
 import argparse
 import pandas as pd
 import numpy as np
@@ -23,6 +24,10 @@ from datetime import datetime, timedelta
 # Constants and settings
 FIG_SIZE = (16, 10)  # Default figure size
 DPI = 300  # Resolution for saved images
+# Multithreaded Arrow CSV parser when pyarrow is installed; timestamps are
+# read as plain strings (Arrow would otherwise turn HH:MM:SS into time objects)
+CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') is not None else 'c'
+CSV_DTYPES = {'timestamp': str}
 
 # Team colors for visualization
 TEAM_COLORS = {
@@ -93,11 +98,11 @@ def load_position_data(meeting_key, session_key):
         if os.path.exists(file_path):
             try:
                 print(f"Loading position data from: {file_path}")
-                df = pd.read_csv(file_path)
+                df = pd.read_csv(file_path, engine=CSV_ENGINE, dtype=CSV_DTYPES)
                 
-                # Convert driver numbers to strings for consistency
+                # Driver numbers as string categories: consistent and cheap to group/compare
                 if 'driver_number' in df.columns:
-                    df['driver_number'] = df['driver_number'].astype(str)
+                    df['driver_number'] = df['driver_number'].astype(str).astype('category')
                 
                 # Sort by timestamp if available
                 if 'timestamp' in df.columns:
@@ -130,11 +135,11 @@ def load_lap_data(meeting_key, session_key):
     
     try:
         print(f"Loading lap time data from: {lap_file}")
-        df = pd.read_csv(lap_file)
+        df = pd.read_csv(lap_file, engine=CSV_ENGINE, dtype=CSV_DTYPES)
         
-        # Convert driver numbers to strings for consistency
+        # Driver numbers as string categories: consistent and cheap to group/compare
         if 'driver_number' in df.columns:
-            df['driver_number'] = df['driver_number'].astype(str)
+            df['driver_number'] = df['driver_number'].astype(str).astype('category')
         
         # Sort by timestamp if available
         if 'timestamp' in df.columns:
@@ -232,14 +237,9 @@ def process_position_data(position_df, lap_df=None, driver_info=None, selected_d
     # Filter to top N finishing drivers if specified
     if top_n is not None:
         try:
-            # Get the latest position for each driver to determine finishing order
-            latest_positions = {}
-            
-            # Get the last recorded position for each driver
-            for driver in all_drivers:
-                driver_data = position_df[position_df['driver_number'] == driver]
-                if not driver_data.empty:
-                    latest_positions[driver] = driver_data['position'].iloc[-1]
+            # Get the last recorded position for each driver to determine finishing order
+            latest_rows = position_df.drop_duplicates('driver_number', keep='last')
+            latest_positions = dict(zip(latest_rows['driver_number'], latest_rows['position']))
             
             # Sort drivers by their latest position
             sorted_drivers = sorted(latest_positions.items(), key=lambda x: int(x[1]) if str(x[1]).isdigit() else 999)
@@ -326,10 +326,23 @@ def process_position_data(position_df, lap_df=None, driver_info=None, selected_d
             processed_data['timestamps'] = all_timestamps
         else:
             # If no timestamps, use sequence numbers
-            max_records = max(len(position_df[position_df['driver_number'] == d]) for d in drivers_to_display)
+            driver_counts = position_df['driver_number'].value_counts()
+            max_records = max(driver_counts.get(d, 0) for d in drivers_to_display)
             all_timestamps = list(range(max_records))
             processed_data['timestamps'] = all_timestamps
         
+        if 'timestamp' in position_df.columns:
+            # Position of every driver at every timestamp in a single pass:
+            # the last value recorded at or before each timestamp, carried forward
+            displayed = position_df[position_df['driver_number'].isin(drivers_to_display)]
+            position_grid = (displayed
+                             .drop_duplicates(['timestamp', 'driver_number'], keep='last')
+                             .pivot(index='timestamp', columns='driver_number', values='position')
+                             .reindex(all_timestamps)
+                             .ffill())
+        else:
+            positions_by_driver = dict(tuple(position_df.groupby('driver_number', sort=False, observed=True)))
+        
         # For each driver, get position at each timestamp
         for driver in drivers_to_display:
             driver_name = f"Driver #{driver}"
@@ -351,22 +364,16 @@ def process_position_data(position_df, lap_df=None, driver_info=None, selected_d
                         team_name = driver_info_row['team_name'].iloc[0]
                         team_color = TEAM_COLORS.get(team_name, team_color)
             
-            # Get this driver's position data
-            driver_positions = position_df[position_df['driver_number'] == driver]
-            
             if 'timestamp' in position_df.columns:
-                # Initialize positions array with None (no data)
-                positions = [None] * len(all_timestamps)
-                
-                # Fill in positions where we have data
-                for i, ts in enumerate(all_timestamps):
-                    # Find position data at or before this timestamp
-                    ts_data = driver_positions[driver_positions['timestamp'] <= ts]
-                    if not ts_data.empty:
-                        positions[i] = int(ts_data['position'].iloc[-1])
+                # None where the driver has no data yet
+                if driver in position_grid.columns:
+                    positions = [None if pd.isna(p) else int(p) for p in position_grid[driver].tolist()]
+                else:
+                    positions = [None] * len(all_timestamps)
             else:
                 # If no timestamps, just use the positions in order
-                positions = driver_positions['position'].tolist()
+                driver_positions = positions_by_driver.get(driver)
+                positions = driver_positions['position'].tolist() if driver_positions is not None else []
                 # Pad with None if needed
                 positions.extend([None] * (len(all_timestamps) - len(positions)))
             
@@ -1,11 +1,15 @@
 from pathlib import Path
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Renderização sem interface gráfica
 import matplotlib.pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
 import matplotlib.gridspec as gridspec
 import argparse
+import importlib.util
 import os
+from concurrent.futures import ProcessPoolExecutor
 from scipy.signal import savgol_filter
 
 """
@@ -25,8 +29,26 @@ Uso:
 # Constantes e configurações
 FIG_SIZE = (16, 10)  # Tamanho padrão para gráficos
 DPI = 300  # Resolução para salvar imagens
+PNG_OPTIONS = {'compress_level': 1}  # zlib rápido no PNG: arquivos maiores, gravação mais rápida
 DEFAULT_CMAP = 'viridis'  # Mapa de cores padrão
 POS_CMAP = 'plasma'  # Mapa de cores para o traçado do circuito
+MAX_PLOT_POINTS = 2000  # Pontos por série após a redução LTTB nos gráficos de linha
+MAX_CHART_WORKERS = 4  # Processos para gerar os gráficos em paralelo
+
+# Colunas lidas de cada CSV (as demais são ignoradas já no parser) e seus tipos;
+# gear/drs ficam em float32 porque podem conter valores ausentes
+TELEMETRY_COLUMNS = {'timestamp', 'driver_number', 'speed', 'rpm', 'throttle', 'brake', 'gear', 'drs'}
+TELEMETRY_DTYPES = {'timestamp': str, 'speed': 'float32', 'rpm': 'float32', 'throttle': 'float32',
+                    'brake': 'float32', 'gear': 'float32', 'drs': 'float32'}
+# Cópia Parquet do arquivo geral (gravada pelo CarDataProcessor), lida com filtro por piloto
+PARQUET_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+POSITION_COLUMNS = {'timestamp', 'driver_number', 'x', 'y'}
+POSITION_DTYPES = {'timestamp': str, 'x': 'float32', 'y': 'float32'}
+TIMING_COLUMNS = {'timestamp', 'driver_number', 'lap_time'}
+
+# Simplificação agressiva de caminhos no Agg: vértices que desviam menos de
+# 1 pixel da linha são descartados ao desenhar as séries densas
+plt.rcParams['path.simplify_threshold'] = 1.0
 
 # Cores para diferentes métricas
 COLORS = {
@@ -71,7 +93,7 @@ def parse_args():
     
     return parser.parse_args()
 
-def load_telemetry_data(meeting_key, session_key, driver_number):
+def load_telemetry_data(meeting_key, session_key, driver_number, general_cache=None):
     """
     Carrega os dados de telemetria do piloto especificado.
     
@@ -79,28 +101,44 @@ def load_telemetry_data(meeting_key, session_key, driver_number):
         meeting_key: Chave do evento
         session_key: Chave da sessão
         driver_number: Número do piloto
+        general_cache: Dicionário opcional que guarda o arquivo geral já lido,
+            para que vários pilotos sejam filtrados da mesma leitura
         
     Returns:
         pd.DataFrame: DataFrame contendo os dados de telemetria
     """
-    # Tentar carregar o arquivo específico do piloto primeiro (é mais eficiente)
+    parquet_file = f"f1_data/processed/{meeting_key}/{session_key}/CarData.z/car_data.parquet"
     driver_file = f"f1_data/processed/{meeting_key}/{session_key}/CarData.z/drivers/telemetry_driver_{driver_number}.csv"
     
-    # Se não existir arquivo específico do piloto, carregar o arquivo geral e filtrar
-    if not os.path.exists(driver_file):
+    # Preferir a cópia Parquet (ordenada por piloto): só os grupos de linhas do piloto são lidos
+    if PARQUET_AVAILABLE and os.path.exists(parquet_file):
+        print(f"Carregando dados de telemetria do piloto #{driver_number} de: {parquet_file}")
+        df = pd.read_parquet(parquet_file, filters=[('driver_number', '==', str(driver_number))])
+        df = df[[c for c in df.columns if c in TELEMETRY_COLUMNS]]
+        df = df.astype({c: t for c, t in TELEMETRY_DTYPES.items() if c in df.columns})
+    
+    # Depois, o arquivo específico do piloto
+    elif os.path.exists(driver_file):
+        print(f"Carregando dados de telemetria do piloto #{driver_number} de: {driver_file}")
+        df = pd.read_csv(driver_file, usecols=lambda c: c in TELEMETRY_COLUMNS, dtype=TELEMETRY_DTYPES)
+    
+    # Por último, carregar o arquivo geral e filtrar
+    else:
         general_file = f"f1_data/processed/{meeting_key}/{session_key}/CarData.z/car_data.csv"
         
         if not os.path.exists(general_file):
             raise FileNotFoundError(f"Arquivo de telemetria não encontrado: {general_file}")
         
-        print(f"Carregando dados de telemetria de: {general_file}")
-        df = pd.read_csv(general_file)
+        if general_cache is not None and general_file in general_cache:
+            df = general_cache[general_file]
+        else:
+            print(f"Carregando dados de telemetria de: {general_file}")
+            df = pd.read_csv(general_file, usecols=lambda c: c in TELEMETRY_COLUMNS, dtype=TELEMETRY_DTYPES)
+            if general_cache is not None:
+                general_cache[general_file] = df
         
         # Filtrar para o piloto especificado
         df = df[df['driver_number'].astype(str) == str(driver_number)].copy()
-    else:
-        print(f"Carregando dados de telemetria do piloto #{driver_number} de: {driver_file}")
-        df = pd.read_csv(driver_file)
     
     if df.empty:
         raise ValueError(f"Nenhum dado de telemetria encontrado para o piloto #{driver_number}")
@@ -160,13 +198,13 @@ def load_position_data(meeting_key, session_key, driver_number):
             return None
         
         print(f"Carregando dados de posição de: {general_file}")
-        df = pd.read_csv(general_file)
+        df = pd.read_csv(general_file, usecols=lambda c: c in POSITION_COLUMNS, dtype=POSITION_DTYPES)
         
         # Filtrar para o piloto especificado
         df = df[df['driver_number'].astype(str) == str(driver_number)].copy()
     else:
         print(f"Carregando dados de posição do piloto #{driver_number} de: {driver_file}")
-        df = pd.read_csv(driver_file)
+        df = pd.read_csv(driver_file, usecols=lambda c: c in POSITION_COLUMNS, dtype=POSITION_DTYPES)
     
     if df.empty:
         print(f"Aviso: Nenhum dado de posição encontrado para o piloto #{driver_number}")
@@ -202,7 +240,7 @@ def load_timing_data(meeting_key, session_key, driver_number):
         return None
     
     try:
-        df = pd.read_csv(lap_file)
+        df = pd.read_csv(lap_file, usecols=lambda c: c in TIMING_COLUMNS, dtype={'timestamp': str})
         
         # Filtrar para o piloto especificado
         df = df[df['driver_number'].astype(str) == str(driver_number)].copy()
@@ -328,6 +366,88 @@ def smooth_telemetry(df, smooth_window=15, poly_order=3):
     
     return smoothed_df
 
+def downsample_lttb(x, y, n_out=MAX_PLOT_POINTS):
+    """
+    Reduz uma série para n_out pontos com Largest-Triangle-Three-Buckets (LTTB).
+    
+    Mantém o primeiro e o último ponto e, em cada bucket intermediário, o ponto
+    que forma o maior triângulo com o ponto escolhido antes e a média do
+    próximo bucket, preservando picos e vales da curva.
+    
+    Args:
+        x: Valores do eixo X
+        y: Valores do eixo Y
+        n_out: Número de pontos desejado
+        
+    Returns:
+        tuple: (x reduzido, y reduzido) como arrays NumPy
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    
+    if n <= n_out or n_out < 3:
+        return x, y
+    
+    # Limites dos n_out - 2 buckets entre o primeiro e o último ponto
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    
+    # Médias de cada bucket via somas acumuladas (usadas como "próximo bucket")
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    counts = np.diff(edges)
+    mean_x = (cum_x[edges[1:]] - cum_x[edges[:-1]]) / counts
+    mean_y = (cum_y[edges[1:]] - cum_y[edges[:-1]]) / counts
+    
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        
+        # Ponto de referência à direita: média do próximo bucket (ou o último ponto)
+        if i < n_out - 3:
+            next_x, next_y = mean_x[i + 1], mean_y[i + 1]
+        else:
+            next_x, next_y = x[-1], y[-1]
+        
+        # Área (dobrada) dos triângulos formados com o ponto anterior escolhido
+        bucket_x = x[start:end]
+        bucket_y = y[start:end]
+        areas = np.abs((x[a] - next_x) * (bucket_y - y[a]) - (x[a] - bucket_x) * (next_y - y[a]))
+        
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    
+    return x[selected], y[selected]
+
+def step_change_points(x, y):
+    """
+    Reduz um sinal em degraus (como o DRS) aos pontos onde o valor muda.
+    
+    Desenhado com drawstyle='steps-post', o resultado é idêntico à série
+    completa, mas com um vértice por mudança de estado em vez de um por amostra.
+    
+    Args:
+        x: Valores do eixo X
+        y: Valores do sinal
+        
+    Returns:
+        tuple: (x, y) das mudanças, incluindo o primeiro e o último ponto
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    
+    if len(y) < 2:
+        return x, y
+    
+    # Índices onde o valor difere do anterior, mais o início e o fim da série
+    keep = np.flatnonzero(y[1:] != y[:-1]) + 1
+    keep = np.concatenate(([0], keep, [len(y) - 1]))
+    return x[keep], y[keep]
+
 def create_telemetry_over_time(telemetry_df, race_name, session_name, driver_number, lap_segments, output_path, smooth=False):
     """
     Cria visualização de telemetria ao longo do tempo.
@@ -348,42 +468,43 @@ def create_telemetry_over_time(telemetry_df, race_name, session_name, driver_num
     # Criar figura
     fig = plt.figure(figsize=FIG_SIZE, dpi=100)
     
-    # Definir layout com 4 subplots compartilhando o eixo X
-    gs = gridspec.GridSpec(4, 1, height_ratios=[3, 2, 2, 1])
+    # Definir layout com 5 subplots compartilhando o eixo X
+    gs = gridspec.GridSpec(5, 1, height_ratios=[3, 2, 2, 1, 1])
     
-    # Criar array de pontos para o eixo X (ponto de dados)
+    # Criar array de pontos para o eixo X (ponto de dados); as séries densas são
+    # reduzidas com LTTB antes de plotar, mantendo os índices originais no eixo X
     x = np.arange(len(telemetry_df))
     
     # 1. Gráfico de Velocidade
     ax1 = plt.subplot(gs[0])
-    ax1.plot(x, telemetry_df['speed'], color=COLORS['speed'], linewidth=1.5)
+    ax1.plot(*downsample_lttb(x, telemetry_df['speed']), color=COLORS['speed'], linewidth=1.5, rasterized=True)
     ax1.set_ylabel('Speed (km/h)', fontsize=10)
     ax1.set_title(f"Telemetry - {race_name} - {session_name} - Driver #{driver_number}", fontsize=14)
     ax1.grid(True, alpha=0.3)
     
     # 2. Gráfico de RPM
     ax2 = plt.subplot(gs[1], sharex=ax1)
-    ax2.plot(x, telemetry_df['rpm'], color=COLORS['rpm'], linewidth=1.5)
+    ax2.plot(*downsample_lttb(x, telemetry_df['rpm']), color=COLORS['rpm'], linewidth=1.5, rasterized=True)
     ax2.set_ylabel('Engine RPM', fontsize=10)
     ax2.grid(True, alpha=0.3)
     
     # 3. Gráfico de Throttle/Brake
     ax3 = plt.subplot(gs[2], sharex=ax1)
-    ax3.plot(x, telemetry_df['throttle'], color=COLORS['throttle'], linewidth=1.5, label='Throttle %')
+    ax3.plot(*downsample_lttb(x, telemetry_df['throttle']), color=COLORS['throttle'], linewidth=1.5, label='Throttle %', rasterized=True)
     
     if 'brake' in telemetry_df.columns:
-        ax3.plot(x, telemetry_df['brake'], color=COLORS['brake'], linewidth=1.5, label='Brake %')
+        ax3.plot(*downsample_lttb(x, telemetry_df['brake']), color=COLORS['brake'], linewidth=1.5, label='Brake %', rasterized=True)
     
     ax3.set_ylabel('Pedal %', fontsize=10)
     ax3.set_ylim(-5, 105)  # Dar margem para visualização
     ax3.grid(True, alpha=0.3)
     ax3.legend(loc='upper right')
     
-    # 4. Gráfico de Gear/DRS
+    # 4. Gráfico de Gear
     ax4 = plt.subplot(gs[3], sharex=ax1)
     
     if 'gear' in telemetry_df.columns:
-        ax4.plot(x, telemetry_df['gear'], color=COLORS['gear'], linewidth=1.5, label='Gear')
+        ax4.plot(*downsample_lttb(x, telemetry_df['gear']), color=COLORS['gear'], linewidth=1.5, label='Gear', rasterized=True)
         ax4.set_ylabel('Gear', fontsize=10)
         
         # Ajustar limites do eixo Y para os valores de marcha
@@ -393,17 +514,21 @@ def create_telemetry_over_time(telemetry_df, race_name, session_name, driver_num
         # Definir ticks específicos para marchas
         ax4.set_yticks(range(int(max_gear) + 1))
     
+    ax4.grid(True, alpha=0.3)
+    
+    # 5. Gráfico de DRS (subplot próprio em vez de um segundo eixo Y sobre as marchas)
+    ax5 = plt.subplot(gs[4], sharex=ax1)
+    
     if 'drs' in telemetry_df.columns:
-        # Criar um segundo eixo Y para DRS
-        ax4_twin = ax4.twinx()
-        ax4_twin.plot(x, telemetry_df['drs'] * max_gear, color=COLORS['drs'], linewidth=1, alpha=0.7, label='DRS')
-        ax4_twin.set_ylabel('DRS', fontsize=10)
-        ax4_twin.set_ylim(-0.5, max_gear + 0.5)
-        ax4_twin.set_yticks([0, max_gear])
-        ax4_twin.set_yticklabels(['OFF', 'ON'])
+        ax5.plot(*step_change_points(x, telemetry_df['drs']), drawstyle='steps-post',
+                 color=COLORS['drs'], linewidth=1, alpha=0.7, label='DRS', rasterized=True)
+        ax5.set_ylim(-0.25, 1.25)
+        ax5.set_yticks([0, 1])
+        ax5.set_yticklabels(['OFF', 'ON'])
     
-    ax4.grid(True, alpha=0.3)
-    ax4.set_xlabel('Data Point', fontsize=10)
+    ax5.set_ylabel('DRS', fontsize=10)
+    ax5.grid(True, alpha=0.3)
+    ax5.set_xlabel('Data Point', fontsize=10)
     
     # Adicionar marcadores de volta se disponíveis
     if lap_segments:
@@ -412,7 +537,7 @@ def create_telemetry_over_time(telemetry_df, race_name, session_name, driver_num
             end_idx = lap_info['end_idx']
             
             # Adicionar marcações verticais para início e fim de volta
-            for ax in [ax1, ax2, ax3, ax4]:
+            for ax in [ax1, ax2, ax3, ax4, ax5]:
                 ax.axvline(x=start_idx, color='k', linestyle='--', alpha=0.5)
                 ax.axvline(x=end_idx, color='k', linestyle='--', alpha=0.5)
             
@@ -425,7 +550,7 @@ def create_telemetry_over_time(telemetry_df, race_name, session_name, driver_num
     plt.tight_layout()
     
     # Salvar a visualização
-    plt.savefig(output_path, dpi=DPI)
+    plt.savefig(output_path, dpi=DPI, pil_kwargs=PNG_OPTIONS)
     print(f"Visualização de telemetria salva em: {output_path}")
     plt.close()
 
@@ -490,7 +615,8 @@ def create_speed_trace_visualization(telemetry_df, position_df, race_name, sessi
         c=metric_values,
         cmap=POS_CMAP,
         s=5,
-        alpha=0.8
+        alpha=0.8,
+        rasterized=True
     )
     
     # Adicionar barra de cores
@@ -523,7 +649,7 @@ def create_speed_trace_visualization(telemetry_df, position_df, race_name, sessi
     plt.tight_layout()
     
     # Salvar a visualização
-    plt.savefig(output_path, dpi=DPI)
+    plt.savefig(output_path, dpi=DPI, pil_kwargs=PNG_OPTIONS)
     print(f"Visualização do traçado por {metric} salva em: {output_path}")
     plt.close()
 
@@ -555,22 +681,22 @@ def create_driver_comparison(telemetry1_df, telemetry2_df, race_name, session_na
     fig, axs = plt.subplots(3, 1, figsize=FIG_SIZE, dpi=100, sharex=True)
     
     # 1. Comparação de velocidade
-    axs[0].plot(x1, telemetry1_df['speed'], color='blue', linewidth=1.5, label=f'Driver #{driver1}')
-    axs[0].plot(x2, telemetry2_df['speed'], color='red', linewidth=1.5, label=f'Driver #{driver2}')
+    axs[0].plot(*downsample_lttb(x1, telemetry1_df['speed']), color='blue', linewidth=1.5, label=f'Driver #{driver1}', rasterized=True)
+    axs[0].plot(*downsample_lttb(x2, telemetry2_df['speed']), color='red', linewidth=1.5, label=f'Driver #{driver2}', rasterized=True)
     axs[0].set_ylabel('Speed (km/h)', fontsize=10)
     axs[0].set_title(f"Driver Comparison - {race_name} - {session_name}", fontsize=14)
     axs[0].grid(True, alpha=0.3)
     axs[0].legend()
     
     # 2. Comparação de RPM
-    axs[1].plot(x1, telemetry1_df['rpm'], color='blue', linewidth=1.5, alpha=0.7)
-    axs[1].plot(x2, telemetry2_df['rpm'], color='red', linewidth=1.5, alpha=0.7)
+    axs[1].plot(*downsample_lttb(x1, telemetry1_df['rpm']), color='blue', linewidth=1.5, alpha=0.7, rasterized=True)
+    axs[1].plot(*downsample_lttb(x2, telemetry2_df['rpm']), color='red', linewidth=1.5, alpha=0.7, rasterized=True)
     axs[1].set_ylabel('Engine RPM', fontsize=10)
     axs[1].grid(True, alpha=0.3)
     
     # 3. Comparação de Throttle
-    axs[2].plot(x1, telemetry1_df['throttle'], color='blue', linewidth=1.5, alpha=0.7)
-    axs[2].plot(x2, telemetry2_df['throttle'], color='red', linewidth=1.5, alpha=0.7)
+    axs[2].plot(*downsample_lttb(x1, telemetry1_df['throttle']), color='blue', linewidth=1.5, alpha=0.7, rasterized=True)
+    axs[2].plot(*downsample_lttb(x2, telemetry2_df['throttle']), color='red', linewidth=1.5, alpha=0.7, rasterized=True)
     axs[2].set_ylabel('Throttle %', fontsize=10)
     axs[2].set_ylim(-5, 105)
     axs[2].grid(True, alpha=0.3)
@@ -583,7 +709,7 @@ def create_driver_comparison(telemetry1_df, telemetry2_df, race_name, session_na
     plt.tight_layout()
     
     # Salvar a visualização
-    plt.savefig(output_path, dpi=DPI)
+    plt.savefig(output_path, dpi=DPI, pil_kwargs=PNG_OPTIONS)
     print(f"Visualização de comparação entre pilotos salva em: {output_path}")
     plt.close()
 
@@ -630,11 +756,11 @@ def create_lap_comparison(telemetry_df, position_df, timing_df, race_name, sessi
         color = lap_colors[i % len(lap_colors)]
         
         # 1. Velocidade por porcentagem de volta
-        axs[0].plot(x, lap_data['speed'], color=color, linewidth=1.5, 
-                   label=f"Lap {lap_num} - {lap_info['lap_time']}")
+        axs[0].plot(*downsample_lttb(x, lap_data['speed']), color=color, linewidth=1.5, 
+                   label=f"Lap {lap_num} - {lap_info['lap_time']}", rasterized=True)
         
         # 2. Throttle por porcentagem de volta
-        axs[1].plot(x, lap_data['throttle'], color=color, linewidth=1.5)
+        axs[1].plot(*downsample_lttb(x, lap_data['throttle']), color=color, linewidth=1.5, rasterized=True)
     
     # Configurar gráficos
     axs[0].set_title(f"Lap Comparison - {race_name} - {session_name} - Driver #{driver_number}", fontsize=14)
@@ -652,7 +778,7 @@ def create_lap_comparison(telemetry_df, position_df, timing_df, race_name, sessi
     plt.tight_layout()
     
     # Salvar a visualização
-    plt.savefig(output_path, dpi=DPI)
+    plt.savefig(output_path, dpi=DPI, pil_kwargs=PNG_OPTIONS)
     print(f"Visualização de comparação de voltas salva em: {output_path}")
     plt.close()
 
@@ -683,8 +809,11 @@ def main():
     session_name = args.session_name or f"Session_{session_key}"
     
     try:
+        # Arquivo geral de telemetria lido no máximo uma vez para os dois pilotos
+        car_data_cache = {}
+        
         # Carregar dados de telemetria para o piloto principal
-        telemetry_df = load_telemetry_data(meeting_key, session_key, driver_number)
+        telemetry_df = load_telemetry_data(meeting_key, session_key, driver_number, car_data_cache)
         
         # Carregar dados de posição (para traçado do circuito)
         position_df = load_position_data(meeting_key, session_key, driver_number)
@@ -696,33 +825,41 @@ def main():
         laps_to_analyze = args.laps or 3  # Valor padrão: 3 voltas
         lap_segments = identify_laps(telemetry_df, timing_df, laps_to_analyze)
         
-        # 1. Visualização de telemetria ao longo do tempo
-        telemetry_path = output_dir / f"telemetry_driver_{driver_number}_{meeting_key}_{session_key}.png"
-        create_telemetry_over_time(telemetry_df, race_name, session_name, driver_number, lap_segments, telemetry_path, smooth)
-        
-        # 2. Visualização do traçado por velocidade
-        if position_df is not None:
-            for metric in ['speed', 'throttle', 'brake']:
-                if metric in telemetry_df.columns:
-                    trace_path = output_dir / f"track_{metric}_driver_{driver_number}_{meeting_key}_{session_key}.png"
-                    create_speed_trace_visualization(telemetry_df, position_df, race_name, session_name, driver_number, trace_path, metric, smooth)
-        
-        # 3. Comparação de voltas
-        if lap_segments and len(lap_segments) >= 2:
-            lap_compare_path = output_dir / f"lap_comparison_driver_{driver_number}_{meeting_key}_{session_key}.png"
-            create_lap_comparison(telemetry_df, position_df, timing_df, race_name, session_name, driver_number, lap_segments, lap_compare_path, smooth)
-        
-        # 4. Comparação com outro piloto (se especificado)
-        if compare_driver:
-            try:
-                # Carregar dados do segundo piloto
-                compare_telemetry_df = load_telemetry_data(meeting_key, session_key, compare_driver)
-                
-                # Criar visualização comparativa
-                compare_path = output_dir / f"driver_compare_{driver_number}_vs_{compare_driver}_{meeting_key}_{session_key}.png"
-                create_driver_comparison(telemetry_df, compare_telemetry_df, race_name, session_name, driver_number, compare_driver, compare_path, smooth)
-            except Exception as e:
-                print(f"Erro ao criar comparação entre pilotos: {str(e)}")
+        # Gráficos independentes: cada um é gerado em um processo separado
+        # (o pyplot não é thread-safe e o desenho é limitado pela GIL)
+        with ProcessPoolExecutor(max_workers=min(MAX_CHART_WORKERS, os.cpu_count() or 1)) as executor:
+            futures = []
+            
+            # 1. Visualização de telemetria ao longo do tempo
+            telemetry_path = output_dir / f"telemetry_driver_{driver_number}_{meeting_key}_{session_key}.png"
+            futures.append(executor.submit(create_telemetry_over_time, telemetry_df, race_name, session_name, driver_number, lap_segments, telemetry_path, smooth))
+            
+            # 2. Visualização do traçado por velocidade
+            if position_df is not None:
+                for metric in ['speed', 'throttle', 'brake']:
+                    if metric in telemetry_df.columns:
+                        trace_path = output_dir / f"track_{metric}_driver_{driver_number}_{meeting_key}_{session_key}.png"
+                        futures.append(executor.submit(create_speed_trace_visualization, telemetry_df, position_df, race_name, session_name, driver_number, trace_path, metric, smooth))
+            
+            # 3. Comparação de voltas
+            if lap_segments and len(lap_segments) >= 2:
+                lap_compare_path = output_dir / f"lap_comparison_driver_{driver_number}_{meeting_key}_{session_key}.png"
+                futures.append(executor.submit(create_lap_comparison, telemetry_df, position_df, timing_df, race_name, session_name, driver_number, lap_segments, lap_compare_path, smooth))
+            
+            # 4. Comparação com outro piloto (se especificado)
+            if compare_driver:
+                try:
+                    # Carregar dados do segundo piloto
+                    compare_telemetry_df = load_telemetry_data(meeting_key, session_key, compare_driver, car_data_cache)
+                    
+                    # Criar visualização comparativa
+                    compare_path = output_dir / f"driver_compare_{driver_number}_vs_{compare_driver}_{meeting_key}_{session_key}.png"
+                    executor.submit(create_driver_comparison, telemetry_df, compare_telemetry_df, race_name, session_name, driver_number, compare_driver, compare_path, smooth).result()
+                except Exception as e:
+                    print(f"Erro ao criar comparação entre pilotos: {str(e)}")
+            
+            for future in futures:
+                future.result()
         
         print("Todas as visualizações de telemetria foram geradas com sucesso!")
         print(f"As visualizações estão disponíveis em: {output_dir}")
@@ -13,8 +13,11 @@ import os
 import argparse
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Renderização sem interface gráfica
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+import matplotlib.colors as mcolors
 from pathlib import Path
 from datetime import datetime, timedelta
 import matplotlib.dates as mdates
@@ -22,6 +25,10 @@ import matplotlib.dates as mdates
 # Constantes e configurações
 FIG_SIZE = (16, 10)  # Tamanho padrão para gráficos
 DPI = 300  # Resolução para salvar imagens
+PNG_OPTIONS = {'compress_level': 1}  # zlib rápido no PNG: arquivos maiores, gravação mais rápida
+
+# Colunas do histórico/entradas de pneus usadas na extração de stints
+TYRE_COLUMNS = {'timestamp', 'driver_number', 'compound', 'new_tire', 'stint_start'}
 
 # Cores dos compostos de pneus
 COMPOUND_COLORS = {
@@ -33,6 +40,16 @@ COMPOUND_COLORS = {
     'UNKNOWN': 'gray'
 }
 
+# Mesma tabela como Series, para mapear todos os stints de uma vez
+COMPOUND_COLOR_MAP = pd.Series(COMPOUND_COLORS)
+
+# Legenda dos compostos (sem o desconhecido), igual em todos os gráficos
+COMPOUND_LEGEND_HANDLES = [
+    patches.Patch(facecolor=color, edgecolor='black', label=compound)
+    for compound, color in COMPOUND_COLORS.items()
+    if compound != 'UNKNOWN'
+]
+
 def parse_args():
     """Processa os argumentos da linha de comando."""
     parser = argparse.ArgumentParser(description='Visualizar estratégias de pneus da F1')
@@ -85,11 +102,11 @@ def load_tire_data(meeting_key, session_key):
     if os.path.exists(history_file):
         try:
             print(f"Carregando histórico de pneus de: {history_file}")
-            history_df = pd.read_csv(history_file)
+            history_df = pd.read_csv(history_file, usecols=lambda c: c in TYRE_COLUMNS, dtype={'timestamp': str})
             
-            # Converter números de piloto para strings para consistência
+            # Números de piloto como categorias de texto: consistentes e baratos de agrupar/comparar
             if 'driver_number' in history_df.columns:
-                history_df['driver_number'] = history_df['driver_number'].astype(str)
+                history_df['driver_number'] = history_df['driver_number'].astype(str).astype('category')
             
             print(f"Dados de histórico de pneus carregados: {len(history_df)} registros")
         except Exception as e:
@@ -101,11 +118,11 @@ def load_tire_data(meeting_key, session_key):
     if os.path.exists(entries_file):
         try:
             print(f"Carregando entradas de pneus de: {entries_file}")
-            entries_df = pd.read_csv(entries_file)
+            entries_df = pd.read_csv(entries_file, usecols=lambda c: c in TYRE_COLUMNS, dtype={'timestamp': str})
             
-            # Converter números de piloto para strings para consistência
+            # Números de piloto como categorias de texto: consistentes e baratos de agrupar/comparar
             if 'driver_number' in entries_df.columns:
-                entries_df['driver_number'] = entries_df['driver_number'].astype(str)
+                entries_df['driver_number'] = entries_df['driver_number'].astype(str).astype('category')
             
             print(f"Dados de entradas de pneus carregados: {len(entries_df)} registros")
         except Exception as e:
@@ -170,9 +187,9 @@ def load_position_data(meeting_key, session_key):
                 print(f"Carregando dados de posição de: {file_path}")
                 df = pd.read_csv(file_path)
                 
-                # Converter números de piloto para strings para consistência
+                # Números de piloto como categorias de texto: consistentes e baratos de agrupar/comparar
                 if 'driver_number' in df.columns:
-                    df['driver_number'] = df['driver_number'].astype(str)
+                    df['driver_number'] = df['driver_number'].astype(str).astype('category')
                 
                 print(f"Dados de posição carregados: {len(df)} registros")
                 return df
@@ -231,17 +248,15 @@ def process_tire_data(history_df, entries_df, driver_positions=None, driver_info
                     driver_positions = driver_positions.sort_values('timestamp')
                 
                 # Pegar a última posição de cada piloto
-                for driver in all_drivers:
-                    driver_data = driver_positions[driver_positions['driver_number'] == driver]
-                    if not driver_data.empty:
-                        final_positions[driver] = driver_data['position'].iloc[-1]
+                known = driver_positions[driver_positions['driver_number'].isin(all_drivers)]
+                last_rows = known.drop_duplicates('driver_number', keep='last')
+                final_positions = dict(zip(last_rows['driver_number'], last_rows['position']))
             
             # Abordagem 2: Se temos uma coluna 'grid_position', usar diretamente
             elif 'grid_position' in driver_positions.columns:
-                for driver in all_drivers:
-                    driver_data = driver_positions[driver_positions['driver_number'] == driver]
-                    if not driver_data.empty:
-                        final_positions[driver] = driver_data['grid_position'].iloc[0]
+                known = driver_positions[driver_positions['driver_number'].isin(all_drivers)]
+                first_rows = known.drop_duplicates('driver_number', keep='first')
+                final_positions = dict(zip(first_rows['driver_number'], first_rows['grid_position']))
             
             # Ordenar pilotos por posição
             if final_positions:
@@ -254,11 +269,19 @@ def process_tire_data(history_df, entries_df, driver_positions=None, driver_info
     # Processar dados por piloto
     driver_data = {}
     
+    # Minutos desde o início da sessão, calculados uma vez para todos os registros
+    df_to_use = df_to_use.assign(session_minute=convert_timestamps_to_minutes(df_to_use['timestamp']))
+    
+    # Ordenar uma vez e separar os registros por piloto em uma única passada
+    history_by_driver = dict(tuple(
+        df_to_use.sort_values('timestamp', kind='stable').groupby('driver_number', sort=False, observed=True)
+    ))
+    
     for driver in drivers_to_display:
-        # Filtrar dados para este piloto
-        driver_history = df_to_use[df_to_use['driver_number'] == driver].sort_values('timestamp')
+        # Dados deste piloto
+        driver_history = history_by_driver.get(driver)
         
-        if driver_history.empty:
+        if driver_history is None or driver_history.empty:
             print(f"Aviso: Nenhum dado de pneus para o piloto #{driver}")
             continue
         
@@ -297,6 +320,7 @@ def process_tire_data(history_df, entries_df, driver_positions=None, driver_info
             if new_stint:
                 stint = {
                     'start_time': row['timestamp'],
+                    'start_minute': row['session_minute'],
                     'compound': row.get('compound', 'UNKNOWN'),
                     'new_tire': row.get('new_tire', False),
                     'end_time': None  # Será definido posteriormente
@@ -306,6 +330,11 @@ def process_tire_data(history_df, entries_df, driver_positions=None, driver_info
             # Atualizar o tempo de término do stint atual
             if stints:
                 stints[-1]['end_time'] = row['timestamp']
+                stints[-1]['end_minute'] = row['session_minute']
+        
+        # Duração de cada stint em minutos
+        for stint in stints:
+            stint['duration'] = stint['end_minute'] - stint['start_minute']
         
         # Armazenar os dados de stints para este piloto
         driver_data[driver] = {
@@ -315,25 +344,19 @@ def process_tire_data(history_df, entries_df, driver_positions=None, driver_info
     
     return driver_data
 
-def convert_to_minute_duration(time_str):
+def convert_timestamps_to_minutes(timestamps):
     """
-    Converte um timestamp no formato HH:MM:SS.sss para minutos desde o início da sessão.
+    Converte uma coluna de timestamps HH:MM:SS.sss em minutos desde o início da sessão.
     
     Args:
-        time_str: String no formato HH:MM:SS.sss
+        timestamps: Series com strings no formato HH:MM:SS.sss
         
     Returns:
-        float: Duração em minutos
+        pd.Series: Minutos desde o início da sessão (0 para valores inválidos)
     """
-    try:
-        time_parts = time_str.split(':')
-        hours = int(time_parts[0])
-        minutes = int(time_parts[1])
-        seconds = float(time_parts[2])
-        
-        return hours * 60 + minutes + seconds / 60
-    except:
-        return 0
+    parts = timestamps.astype(str).str.extract(r'^(\d+):(\d+):(\d+(?:\.\d+)?)(?=:|$)').astype(float)
+    minutes = parts[0] * 60 + parts[1] + parts[2] / 60
+    return minutes.fillna(0)
 
 def create_tire_strategy_chart(driver_data, race_name, session_name, output_path, dark_mode=False):
     """
@@ -368,60 +391,57 @@ def create_tire_strategy_chart(driver_data, race_name, session_name, output_path
     # Definir eixo Y para os pilotos
     drivers = list(driver_data.keys())
     
-    # Converter tempos para duração em minutos
-    for driver, data in driver_data.items():
-        for stint in data['stints']:
-            stint['start_minute'] = convert_to_minute_duration(stint['start_time'])
-            stint['end_minute'] = convert_to_minute_duration(stint['end_time'])
-            stint['duration'] = stint['end_minute'] - stint['start_minute']
-    
     # Determinar o tempo máximo da sessão em minutos
     max_time = 0
     for data in driver_data.values():
         for stint in data['stints']:
             max_time = max(max_time, stint['end_minute'])
     
-    # Plotar as barras de stint para cada piloto
+    # Reunir os stints de todos os pilotos em colunas paralelas
+    y_positions = []
+    starts = []
+    durations = []
+    compounds = []
+    new_tires = []
     for i, (driver, data) in enumerate(driver_data.items()):
         y_pos = len(drivers) - i - 1  # Reverter ordem para pilotos do topo ficarem em cima
         
         for stint in data['stints']:
-            # Determinar cor com base no composto
-            compound = stint['compound']
-            color = COMPOUND_COLORS.get(compound, COMPOUND_COLORS['UNKNOWN'])
-            
-            # Ajustar altura da barra (menor para barras mais finas)
-            bar_height = 0.6
-            
-            # Criar retângulo para o stint
-            rect = patches.Rectangle(
-                (stint['start_minute'], y_pos - bar_height/2),
-                stint['duration'],
-                bar_height,
-                linewidth=1,
-                edgecolor='black',
-                facecolor=color,
-                alpha=0.8 if color != 'white' else 1.0  # Ajustar alfa para cores claras
-            )
-            ax.add_patch(rect)
-            
-            # Adicionar texto indicando o composto
-            # Apenas adicionar se o stint for longo o suficiente para ser visível
-            if stint['duration'] > 3:
-                text_x = stint['start_minute'] + stint['duration'] / 2
-                text_y = y_pos
-                
-                # Escolher cor do texto com base na cor do composto
-                if color in ['yellow', 'white']:
-                    text_color_stint = 'black'
-                else:
-                    text_color_stint = 'white'
-                
-                # Adicionar texto do composto
-                new_marker = "N" if stint['new_tire'] else ""
-                ax.text(text_x, text_y, f"{compound[0]}{new_marker}", 
-                        ha='center', va='center', fontsize=8, 
-                        fontweight='bold', color=text_color_stint)
+            y_positions.append(y_pos)
+            starts.append(stint['start_minute'])
+            durations.append(stint['duration'])
+            compounds.append(stint['compound'])
+            new_tires.append(stint['new_tire'])
+    
+    # Determinar cor com base no composto (alfa maior para cores claras)
+    colors = pd.Series(compounds, dtype=object).map(COMPOUND_COLOR_MAP).fillna(COMPOUND_COLORS['UNKNOWN']).to_numpy()
+    alphas = np.where(colors == 'white', 1.0, 0.8)
+    
+    # Escolher cor do texto com base na cor do composto
+    stint_text_colors = np.where(np.isin(colors, ['yellow', 'white']), 'black', 'white')
+    
+    # Plotar todas as barras de stint em uma única chamada
+    if compounds:
+        ax.barh(
+            y_positions,
+            durations,
+            left=starts,
+            height=0.6,  # Barras mais finas
+            color=mcolors.to_rgba_array(colors, alpha=alphas),
+            edgecolor=mcolors.to_rgba_array(['black'] * len(colors), alpha=alphas),
+            linewidth=1
+        )
+    
+    # Adicionar texto indicando o composto
+    # Apenas adicionar se o stint for longo o suficiente para ser visível
+    for y_pos, start, duration, compound, new_tire, text_color_stint in zip(
+            y_positions, starts, durations, compounds, new_tires, stint_text_colors):
+        if duration > 3:
+            # Adicionar texto do composto
+            new_marker = "N" if new_tire else ""
+            ax.text(start + duration / 2, y_pos, f"{compound[0]}{new_marker}", 
+                    ha='center', va='center', fontsize=8, 
+                    fontweight='bold', color=text_color_stint)
     
     # Configurar rótulos do eixo Y (nomes dos pilotos)
     y_ticks = list(range(len(drivers)))
@@ -437,23 +457,18 @@ def create_tire_strategy_chart(driver_data, race_name, session_name, output_path
     ax.set_title(f"Tire Strategy - {race_name} - {session_name}", fontsize=14, color=text_color)
     
     # Adicionar legenda para os compostos
-    legend_elements = [
-        patches.Patch(facecolor=color, edgecolor='black', label=compound)
-        for compound, color in COMPOUND_COLORS.items()
-        if compound != 'UNKNOWN'  # Não incluir compostos desconhecidos na legenda
-    ]
-    ax.legend(handles=legend_elements, loc='upper right', bbox_to_anchor=(1.15, 1))
+    ax.legend(handles=COMPOUND_LEGEND_HANDLES, loc='upper right', bbox_to_anchor=(1.15, 1))
     
     # Adicionar grade para facilitar a leitura
     ax.grid(axis='x', linestyle='--', alpha=0.3, color=grid_color)
     
     # Ajustar layout
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Salvar a visualização
-    plt.savefig(output_path, dpi=DPI, facecolor=bg_color)
+    fig.savefig(output_path, dpi=DPI, pil_kwargs=PNG_OPTIONS, facecolor=bg_color)
     print(f"Visualização de estratégia de pneus salva em: {output_path}")
-    plt.close()
+    plt.close(fig)
 
 def create_compound_distribution_chart(driver_data, race_name, session_name, output_path, dark_mode=False):
     """
@@ -498,7 +513,7 @@ def create_compound_distribution_chart(driver_data, race_name, session_name, out
         del compound_counts['UNKNOWN']
     
     # Criar figura
-    plt.figure(figsize=(12, 8), dpi=100)
+    fig, ax = plt.subplots(figsize=(12, 8), dpi=100)
     
     # Criar gráfico de barras
     compounds = list(compound_counts.keys())
@@ -508,29 +523,29 @@ def create_compound_distribution_chart(driver_data, race_name, session_name, out
     colors = [COMPOUND_COLORS.get(c, 'gray') for c in compounds]
     
     # Criar gráfico de barras
-    bars = plt.bar(compounds, counts, color=colors, edgecolor='black')
+    bars = ax.bar(compounds, counts, color=colors, edgecolor='black')
     
     # Adicionar valores acima das barras
     for bar in bars:
         height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                 str(int(height)), ha='center', va='bottom', fontsize=10, color=text_color)
+        ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
+                str(int(height)), ha='center', va='bottom', fontsize=10, color=text_color)
     
     # Configurar título e rótulos
-    plt.title(f"Tire Compound Distribution - {race_name} - {session_name}", fontsize=14, color=text_color)
-    plt.xlabel("Compound", fontsize=12, color=text_color)
-    plt.ylabel("Count", fontsize=12, color=text_color)
+    ax.set_title(f"Tire Compound Distribution - {race_name} - {session_name}", fontsize=14, color=text_color)
+    ax.set_xlabel("Compound", fontsize=12, color=text_color)
+    ax.set_ylabel("Count", fontsize=12, color=text_color)
     
     # Adicionar grade para facilitar a leitura
-    plt.grid(axis='y', linestyle='--', alpha=0.3, color=grid_color)
+    ax.grid(axis='y', linestyle='--', alpha=0.3, color=grid_color)
     
     # Ajustar layout
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Salvar a visualização
-    plt.savefig(output_path, dpi=DPI, facecolor=bg_color)
+    fig.savefig(output_path, dpi=DPI, pil_kwargs=PNG_OPTIONS, facecolor=bg_color)
     print(f"Visualização de distribuição de compostos salva em: {output_path}")
-    plt.close()
+    plt.close(fig)
 
 def create_stint_duration_chart(driver_data, race_name, session_name, output_path, dark_mode=False):
     """
@@ -577,7 +592,7 @@ def create_stint_duration_chart(driver_data, race_name, session_name, output_pat
         del stint_durations['UNKNOWN']
     
     # Criar figura
-    plt.figure(figsize=(12, 8), dpi=100)
+    fig, ax = plt.subplots(figsize=(12, 8), dpi=100)
     
     # Preparar dados para boxplot
     data = []
@@ -591,7 +606,9 @@ def create_stint_duration_chart(driver_data, race_name, session_name, output_pat
         colors.append(COMPOUND_COLORS.get(compound, 'gray'))
     
     # Criar boxplot
-    boxplot = plt.boxplot(data, patch_artist=True, labels=labels)
+    boxplot = ax.boxplot(data, patch_artist=True)
+    ax.set_xticks(range(1, len(labels) + 1))
+    ax.set_xticklabels(labels)
     
     # Colorir boxes de acordo com os compostos
     for patch, color in zip(boxplot['boxes'], colors):
@@ -600,24 +617,24 @@ def create_stint_duration_chart(driver_data, race_name, session_name, output_pat
     
     # Adicionar média como ponto
     for i, compound_data in enumerate(data):
-        plt.scatter([i+1] * len(compound_data), compound_data, 
-                    color='black', alpha=0.5, s=20, zorder=5)
+        ax.scatter([i+1] * len(compound_data), compound_data, 
+                   color='black', alpha=0.5, s=20, zorder=5)
     
     # Configurar título e rótulos
-    plt.title(f"Stint Duration by Compound - {race_name} - {session_name}", fontsize=14, color=text_color)
-    plt.xlabel("Compound", fontsize=12, color=text_color)
-    plt.ylabel("Duration (minutes)", fontsize=12, color=text_color)
+    ax.set_title(f"Stint Duration by Compound - {race_name} - {session_name}", fontsize=14, color=text_color)
+    ax.set_xlabel("Compound", fontsize=12, color=text_color)
+    ax.set_ylabel("Duration (minutes)", fontsize=12, color=text_color)
     
     # Adicionar grade para facilitar a leitura
-    plt.grid(axis='y', linestyle='--', alpha=0.3, color=grid_color)
+    ax.grid(axis='y', linestyle='--', alpha=0.3, color=grid_color)
     
     # Ajustar layout
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Salvar a visualização
-    plt.savefig(output_path, dpi=DPI, facecolor=bg_color)
+    fig.savefig(output_path, dpi=DPI, pil_kwargs=PNG_OPTIONS, facecolor=bg_color)
     print(f"Visualização de duração de stints salva em: {output_path}")
-    plt.close()
+    plt.close(fig)
 
 def main():
     """Função principal do script."""
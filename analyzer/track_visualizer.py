@@ -13,27 +13,52 @@ Data: [Data atual]
 """
 
 import os
+import importlib.util
 import argparse
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Renderização sem interface gráfica
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 from matplotlib.colors import LinearSegmentedColormap
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib.gridspec as gridspec
 
 # Constantes e configurações
 DEFAULT_CMAP = 'viridis'  # Mapa de cores padrão
 SCATTER_SIZES = {
     '2d': 2,     # Tamanho dos pontos no gráfico 2D
-    '3d': 0.5    # Tamanho dos pontos no gráfico 3D (menores no 3D para melhor visualização)
 }
+TRACK_LINE_WIDTH = 0.5  # Espessura das linhas do traçado 3D
 DEFAULT_ALPHA = 0.8  # Transparência padrão dos pontos
 FIG_SIZE = {
     '2d': (14, 12),  # Tamanho da figura 2D
     '3d': (16, 14)   # Tamanho da figura 3D
 }
 DPI = 300  # Resolução das imagens salvas
+PREVIEW_DPI = 150  # Resolução usada com --preview
+PNG_OPTIONS = {'compress_level': 1}  # zlib rápido no PNG: arquivos maiores, gravação mais rápida
+# Parser CSV multithread do Arrow quando o pyarrow está instalado; timestamps
+# lidos como texto (o Arrow converteria HH:MM:SS em objetos time)
+CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') is not None else 'c'
+CSV_DTYPES = {'timestamp': str}
+PARQUET_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+COORD_COLUMNS = ['x', 'y', 'z']  # Colunas de coordenadas do traçado
+MAX_SCATTER_POINTS = 5000  # Máximo de pontos por traçado nos gráficos de dispersão
+MAX_CHART_WORKERS = 4  # Processos para gerar os gráficos em paralelo
+POSITION_CHUNK_ROWS = 500_000  # Linhas por bloco ao ler o arquivo de posição para um só piloto
+# Nomes alternativos aceitos para cada coluna padrão do arquivo de posição
+COLUMN_MAPPING = {
+    'x': ['x', 'x_coord', 'X'],
+    'y': ['y', 'y_coord', 'Y'],
+    'z': ['z', 'z_coord', 'Z'],
+    'driver_number': ['driver_number', 'driver', 'DriverNumber']
+}
+# Índice reverso: nome alternativo -> coluna padrão
+COLUMN_ALIASES = {alias: column for column, aliases in COLUMN_MAPPING.items() for alias in aliases}
 
 def parse_args():
     """Processa os argumentos da linha de comando."""
@@ -63,6 +88,9 @@ def parse_args():
     parser.add_argument('--3d-only', dest='three_d_only', action='store_true',
                         help='Gerar apenas visualizações 3D')
     
+    parser.add_argument('--preview', action='store_true',
+                        help=f'Salvar em resolução reduzida ({PREVIEW_DPI} DPI) para revisão rápida')
+    
     parser.add_argument('--race-name', type=str, default=None,
                         help='Nome personalizado para o evento (ex: "Miami Grand Prix")')
     
@@ -71,13 +99,15 @@ def parse_args():
     
     return parser.parse_args()
 
-def load_position_data(meeting_key, session_key):
+def load_position_data(meeting_key, session_key, driver_filter=None):
     """
     Carrega os dados de posição do arquivo processado.
     
     Args:
         meeting_key: Chave do evento
         session_key: Chave da sessão
+        driver_filter: Número do piloto cujas linhas devem ser mantidas, ou None
+            para carregar todos os pilotos
         
     Returns:
         pd.DataFrame: DataFrame contendo os dados de posição
@@ -89,35 +119,47 @@ def load_position_data(meeting_key, session_key):
     if not os.path.exists(position_file):
         raise FileNotFoundError(f"Arquivo de posição não encontrado: {position_file}")
     
-    # Carregar o arquivo CSV
-    print(f"Carregando dados de posição de: {position_file}")
-    df = pd.read_csv(position_file)
-    
-    # Verificar colunas esperadas
+    # Cópia em Parquet gravada numa carga anterior: usar se for mais recente que o CSV
+    parquet_file = position_file[:-len('.csv')] + '.parquet'
+    if (PARQUET_AVAILABLE and os.path.exists(parquet_file)
+            and os.path.getmtime(parquet_file) >= os.path.getmtime(position_file)):
+        print(f"Carregando dados de posição de: {parquet_file}")
+        filters = [('driver_number', '==', str(driver_filter))] if driver_filter is not None else None
+        df = pd.read_parquet(parquet_file, filters=filters)
+        print(f"Dados carregados: {len(df)} pontos de posição")
+        print(f"Pilotos disponíveis: {sorted(df['driver_number'].unique())}")
+        return df
+    
+    # Verificar colunas esperadas (apenas o cabeçalho é lido aqui)
     required_columns = ['driver_number', 'x', 'y', 'z']
-    missing_columns = [col for col in required_columns if col not in df.columns]
-    
-    # Mapear nomes de colunas padrão para possíveis alternativas
-    column_mapping = {
-        'x': ['x', 'x_coord', 'X'],
-        'y': ['y', 'y_coord', 'Y'],
-        'z': ['z', 'z_coord', 'Z'],
-        'driver_number': ['driver_number', 'driver', 'DriverNumber']
-    }
+    header = pd.read_csv(position_file, nrows=0).columns
+    missing_columns = [col for col in required_columns if col not in header]
     
     # Se colunas estiverem faltando, verificar nomes alternativos
+    new_columns = {}
     if missing_columns:
         print(f"Colunas ausentes: {missing_columns}")
         print("Verificando nomes de colunas alternativos...")
         
-        # Criar um novo mapeamento de colunas
-        new_columns = {}
-        for miss_col in missing_columns:
-            for col in df.columns:
-                if col in column_mapping[miss_col]:
-                    new_columns[col] = miss_col
-                    print(f"Usando '{col}' como '{miss_col}'")
-                    break
+        # Uma passada pelo cabeçalho; a primeira alternativa encontrada vence
+        for col in header:
+            target = COLUMN_ALIASES.get(col)
+            if target in missing_columns and target not in new_columns.values():
+                new_columns[col] = target
+                print(f"Usando '{col}' como '{target}'")
+    
+    # Carregar o arquivo CSV
+    print(f"Carregando dados de posição de: {position_file}")
+    if driver_filter is not None and 'driver_number' in set(header) | set(new_columns.values()):
+        # Apenas um piloto: ler em blocos e manter só as linhas dele, para que o
+        # pico de memória seja um bloco e não o arquivo inteiro
+        chunks = []
+        for chunk in pd.read_csv(position_file, dtype=CSV_DTYPES, chunksize=POSITION_CHUNK_ROWS):
+            chunk = chunk.rename(columns=new_columns)
+            chunks.append(chunk[chunk['driver_number'].astype(str) == str(driver_filter)])
+        df = pd.concat(chunks, ignore_index=True)
+    else:
+        df = pd.read_csv(position_file, engine=CSV_ENGINE, dtype=CSV_DTYPES)
         
         # Renomear colunas se necessário
         if new_columns:
@@ -128,13 +170,26 @@ def load_position_data(meeting_key, session_key):
     if still_missing:
         raise ValueError(f"Dados de posição não contêm colunas essenciais: {still_missing}")
     
-    # Converter números do piloto para strings para consistência
-    df['driver_number'] = df['driver_number'].astype(str)
+    # Números do piloto como categorias de texto: consistentes e baratos de filtrar/agrupar
+    df['driver_number'] = df['driver_number'].astype(str).astype('category')
+    
+    # Coordenadas em float32: precisão suficiente para os gráficos e metade da memória
+    for coord in COORD_COLUMNS:
+        df[coord] = pd.to_numeric(df[coord], errors='coerce').astype('float32')
     
     # Informações básicas sobre os dados carregados
     print(f"Dados carregados: {len(df)} pontos de posição")
     print(f"Pilotos disponíveis: {sorted(df['driver_number'].unique())}")
     
+    # Guardar os dados já normalizados em Parquet para as próximas execuções
+    # (apenas quando o arquivo foi carregado inteiro, sem filtro de piloto)
+    if PARQUET_AVAILABLE and driver_filter is None:
+        try:
+            df.to_parquet(parquet_file, compression='snappy', index=False)
+            print(f"Cópia em Parquet salva em: {parquet_file}")
+        except Exception as e:
+            print(f"Não foi possível salvar a cópia em Parquet: {e}")
+    
     return df
 
 def prepare_track_data(df, driver_number=None):
@@ -150,17 +205,22 @@ def prepare_track_data(df, driver_number=None):
     """
     if driver_number:
         # Filtrar para um piloto específico
-        driver_data = df[df['driver_number'] == str(driver_number)].copy()
+        driver_data = df[df['driver_number'] == str(driver_number)]
         
         if driver_data.empty:
             raise ValueError(f"Nenhum dado encontrado para o piloto #{driver_number}")
         
         print(f"Preparando dados para o piloto #{driver_number}: {len(driver_data)} pontos")
-        return driver_data
+    else:
+        # Se nenhum piloto específico, usar todos os dados
+        driver_data = df
+        print(f"Preparando dados para todos os pilotos: {len(df)} pontos")
+    
+    # Com menos de dois pontos não há traçado: sair antes de qualquer processamento
+    if len(driver_data) < 2:
+        raise ValueError(f"Dados insuficientes para desenhar o traçado: {len(driver_data)} ponto(s)")
     
-    # Se nenhum piloto específico, usar todos os dados
-    print(f"Preparando dados para todos os pilotos: {len(df)} pontos")
-    return df.copy()
+    return driver_data
 
 def clean_track_data(df):
     """
@@ -172,33 +232,113 @@ def clean_track_data(df):
     Returns:
         pd.DataFrame: DataFrame limpo e preparado
     """
-    # Ordenar por timestamp para sequência temporal correta
-    if 'timestamp' in df.columns:
-        df = df.sort_values('timestamp')
+    # Ordenar por timestamp para sequência temporal correta; os arquivos já vêm
+    # em ordem cronológica, então a ordenação só roda quando realmente necessária
+    if 'timestamp' in df.columns and not df['timestamp'].is_monotonic_increasing:
+        df = df.sort_values('timestamp', kind='stable')
     
-    # Criar uma coluna de sequência para coloração
-    df['sequence'] = np.arange(len(df))
+    # Criar uma coluna de sequência para coloração (assign não altera o DataFrame recebido)
+    df = df.assign(sequence=np.arange(len(df), dtype=np.int32))
     
     # Remover outliers nas coordenadas (pontos muito distantes que podem distorcer a visualização)
-    for coord in ['x', 'y', 'z']:
-        q1 = df[coord].quantile(0.05)
-        q3 = df[coord].quantile(0.95)
-        iqr = q3 - q1
-        
-        # Definir limites mais amplos para não perder detalhes do circuito
-        lower_bound = q1 - 2 * iqr
-        upper_bound = q3 + 2 * iqr
-        
-        # Marcar (mas não remover) outliers
-        outliers = (df[coord] < lower_bound) | (df[coord] > upper_bound)
-        n_outliers = outliers.sum()
-        
+    # Quantis das três coordenadas calculados de uma vez sobre a matriz (N, 3)
+    coords = df[COORD_COLUMNS].to_numpy()
+    q1, q3 = np.nanquantile(coords, [0.05, 0.95], axis=0)
+    iqr = q3 - q1
+    
+    # Definir limites mais amplos para não perder detalhes do circuito
+    lower_bound = q1 - 2 * iqr
+    upper_bound = q3 + 2 * iqr
+    
+    # Marcar (mas não remover) outliers
+    outliers = np.count_nonzero((coords < lower_bound) | (coords > upper_bound), axis=0)
+    
+    for coord, n_outliers in zip(COORD_COLUMNS, outliers):
         if n_outliers > 0:
             print(f"Atenção: Identificados {n_outliers} possíveis outliers em {coord}")
     
     return df
 
-def create_2d_track_visualization(df, race_name, session_name, output_path, cmap=DEFAULT_CMAP):
+def decimate_track_data(df, max_points=MAX_SCATTER_POINTS):
+    """
+    Reduz os dados do traçado a no máximo max_points pontos por amostragem uniforme.
+    
+    Os pontos se sobrepõem no gráfico, então a forma do circuito é preservada
+    enquanto o tempo de desenho e a memória caem proporcionalmente.
+    
+    Args:
+        df: DataFrame com dados de posição
+        max_points: Número máximo de pontos a manter
+        
+    Returns:
+        pd.DataFrame: DataFrame amostrado (o próprio df se já for pequeno)
+    """
+    # Divisão arredondada para cima: com len(df) // max_points sobrariam até 2*max_points-1 pontos
+    step = max(1, -(-len(df) // max_points))
+    return df.iloc[::step] if step > 1 else df
+
+def build_track_segments(df):
+    """
+    Monta os segmentos entre pontos consecutivos de cada piloto para o traçado 3D.
+    
+    Args:
+        df: DataFrame com dados de posição preparados (ordenados por tempo)
+        
+    Returns:
+        tuple: (segmentos com forma (N, 2, 3), sequência temporal do início de cada segmento)
+    """
+    ordered = df.dropna(subset=COORD_COLUMNS).sort_values('driver_number', kind='stable')
+    points = ordered[COORD_COLUMNS].to_numpy()
+    drivers = ordered['driver_number'].to_numpy()
+    
+    # Ligar apenas pontos consecutivos do mesmo piloto
+    same_driver = drivers[1:] == drivers[:-1]
+    segments = np.stack([points[:-1], points[1:]], axis=1)[same_driver]
+    sequence = ordered['sequence'].to_numpy()[:-1][same_driver]
+    return segments, sequence
+
+def add_track_lines_3d(ax, df, cmap):
+    """
+    Desenha o traçado 3D como uma única coleção de linhas coloridas pela sequência temporal.
+    
+    Args:
+        ax: Eixo 3D onde desenhar
+        df: DataFrame com dados de posição preparados
+        cmap: Mapa de cores a ser usado
+        
+    Returns:
+        Line3DCollection: A coleção adicionada (para a barra de cores)
+    """
+    segments, sequence = build_track_segments(df)
+    lines = Line3DCollection(segments, cmap=cmap, linewidths=TRACK_LINE_WIDTH,
+                             alpha=DEFAULT_ALPHA, rasterized=True)
+    lines.set_array(sequence)
+    ax.add_collection3d(lines)
+    
+    # Coleções não ajustam os limites dos eixos sozinhas
+    coords = df[COORD_COLUMNS]
+    ax.auto_scale_xyz(coords['x'].dropna(), coords['y'].dropna(), coords['z'].dropna())
+    return lines
+
+def compute_track_distance(x, y):
+    """
+    Calcula a distância acumulada ao longo do traçado no plano XY
+    (aproximação usando distância euclidiana entre pontos consecutivos).
+    
+    Args:
+        x: Coordenadas X em ordem temporal
+        y: Coordenadas Y em ordem temporal
+        
+    Returns:
+        np.ndarray: Distância acumulada em cada ponto (0 no primeiro)
+    """
+    distance = np.zeros(len(x), dtype=np.float64)
+    if len(x) > 1:
+        # hypot calcula sqrt(dx² + dy²) em uma passada; cumsum grava direto no resultado
+        np.cumsum(np.hypot(np.diff(x), np.diff(y)), out=distance[1:])
+    return distance
+
+def create_2d_track_visualization(df, race_name, session_name, output_path, cmap=DEFAULT_CMAP, dpi=DPI):
     """
     Cria visualização 2D do traçado do circuito.
     
@@ -208,18 +348,23 @@ def create_2d_track_visualization(df, race_name, session_name, output_path, cmap
         session_name: Nome da sessão para o título
         output_path: Caminho para salvar a visualização
         cmap: Mapa de cores a ser usado
+        dpi: Resolução da imagem salva
     """
     # Criar figura com tamanho adequado
     plt.figure(figsize=FIG_SIZE['2d'], dpi=100)
     
+    # Amostrar os pontos (pontos sobrepostos não mudam a imagem)
+    df = decimate_track_data(df)
+    
     # Plotar os pontos do traçado
     scatter = plt.scatter(
-        df['x'], 
-        df['y'],
-        c=df['sequence'],  # Colorir pelo sequencial para mostrar a progressão da volta
+        df['x'].to_numpy(dtype=np.float32), 
+        df['y'].to_numpy(dtype=np.float32),
+        c=df['sequence'].to_numpy(),  # Colorir pelo sequencial para mostrar a progressão da volta
         cmap=cmap,
         s=SCATTER_SIZES['2d'],
-        alpha=DEFAULT_ALPHA
+        alpha=DEFAULT_ALPHA,
+        rasterized=True
     )
     
     # Configurar título e rótulos dos eixos
@@ -242,11 +387,11 @@ def create_2d_track_visualization(df, race_name, session_name, output_path, cmap
     plt.tight_layout()
     
     # Salvar a visualização
-    plt.savefig(output_path, dpi=DPI)
+    plt.savefig(output_path, dpi=dpi, pil_kwargs=PNG_OPTIONS)
     print(f"Visualização 2D salva em: {output_path}")
     plt.close()
 
-def create_3d_track_visualization(df, race_name, session_name, output_path, cmap=DEFAULT_CMAP):
+def create_3d_track_visualization(df, race_name, session_name, output_path, cmap=DEFAULT_CMAP, dpi=DPI):
     """
     Cria visualização 3D do traçado do circuito.
     
@@ -256,21 +401,14 @@ def create_3d_track_visualization(df, race_name, session_name, output_path, cmap
         session_name: Nome da sessão para o título
         output_path: Caminho para salvar a visualização
         cmap: Mapa de cores a ser usado
+        dpi: Resolução da imagem salva
     """
     # Criar figura 3D
     fig = plt.figure(figsize=FIG_SIZE['3d'], dpi=100)
     ax = fig.add_subplot(111, projection='3d')
     
-    # Plotar o traçado 3D
-    scatter = ax.scatter(
-        df['x'],
-        df['y'],
-        df['z'],
-        c=df['sequence'],  # Colorir por sequencial para mostrar a progressão
-        cmap=cmap,
-        s=SCATTER_SIZES['3d'],
-        alpha=DEFAULT_ALPHA
-    )
+    # Plotar o traçado 3D (colorido por sequencial para mostrar a progressão)
+    scatter = add_track_lines_3d(ax, df, cmap)
     
     # Configurar títulos e rótulos
     title = f"3D Track Layout - {race_name} - {session_name}"
@@ -289,11 +427,11 @@ def create_3d_track_visualization(df, race_name, session_name, output_path, cmap
     plt.tight_layout()
     
     # Salvar a visualização
-    plt.savefig(output_path, dpi=DPI)
+    plt.savefig(output_path, dpi=dpi, pil_kwargs=PNG_OPTIONS)
     print(f"Visualização 3D salva em: {output_path}")
     plt.close()
 
-def create_multi_driver_visualization(df, race_name, session_name, output_path):
+def create_multi_driver_visualization(df, race_name, session_name, output_path, dpi=DPI):
     """
     Cria visualização de traçados de múltiplos pilotos.
     
@@ -302,28 +440,37 @@ def create_multi_driver_visualization(df, race_name, session_name, output_path):
         race_name: Nome do evento para o título
         session_name: Nome da sessão para o título
         output_path: Caminho para salvar a visualização
+        dpi: Resolução da imagem salva
     """
-    # Obter pilotos únicos
-    drivers = sorted(df['driver_number'].unique())
+    # Agrupar por piloto em uma única passada, mantendo só quem tem dados suficientes
+    groups = [
+        (driver, driver_data)
+        for driver, driver_data in df.groupby('driver_number', sort=True, observed=True)
+        if len(driver_data) > 50
+    ]
     
     # Criar figura com tamanho adequado
     plt.figure(figsize=(15, 10), dpi=100)
     
     # Definir cores distintas para cada piloto
-    colors = plt.cm.jet(np.linspace(0, 1, len(drivers)))
+    colors = plt.cm.jet(np.linspace(0, 1, len(groups)))
     
     # Plotar o traçado de cada piloto com cor diferente
-    for i, driver in enumerate(drivers):
-        driver_data = df[df['driver_number'] == driver]
-        if len(driver_data) > 50:  # Verificar se há dados suficientes
-            plt.scatter(
-                driver_data['x'],
-                driver_data['y'],
-                s=1,
-                alpha=0.7,
-                color=colors[i],
-                label=f"Driver #{driver}"
-            )
+    for (driver, driver_data), color in zip(groups, colors):
+        driver_data = decimate_track_data(driver_data)
+        # Uma linha sem traço por piloto: muito mais barata que um scatter,
+        # já que a cor é a mesma para todos os pontos (markersize=1 ≈ s=1)
+        plt.plot(
+            driver_data['x'].to_numpy(dtype=np.float32),
+            driver_data['y'].to_numpy(dtype=np.float32),
+            linestyle='None',
+            marker='.',
+            markersize=1,
+            alpha=0.7,
+            color=color,
+            label=f"Driver #{driver}",
+            rasterized=True
+        )
     
     # Configurar título e rótulos dos eixos
     title = f"Multi-Driver Track Layout - {race_name} - {session_name}"
@@ -344,11 +491,11 @@ def create_multi_driver_visualization(df, race_name, session_name, output_path):
     plt.tight_layout()
     
     # Salvar a visualização
-    plt.savefig(output_path, dpi=DPI)
+    plt.savefig(output_path, dpi=dpi, pil_kwargs=PNG_OPTIONS)
     print(f"Visualização multi-piloto salva em: {output_path}")
     plt.close()
 
-def create_elevation_profile(df, race_name, session_name, output_path):
+def create_elevation_profile(df, race_name, session_name, output_path, dpi=DPI):
     """
     Cria um perfil de elevação do circuito.
     
@@ -357,23 +504,12 @@ def create_elevation_profile(df, race_name, session_name, output_path):
         race_name: Nome do evento para o título
         session_name: Nome da sessão para o título
         output_path: Caminho para salvar a visualização
+        dpi: Resolução da imagem salva
     """
     # Calcular a distância acumulada ao longo do traçado
-    # (aproximação usando distância euclidiana entre pontos consecutivos)
-    x = df['x'].values
-    y = df['y'].values
+    cumulative_distance = compute_track_distance(df['x'].values, df['y'].values)
     z = df['z'].values
     
-    # Calcular diferenças entre pontos consecutivos
-    dx = np.diff(x)
-    dy = np.diff(y)
-    
-    # Calcular distâncias incrementais (apenas no plano XY)
-    distances = np.sqrt(dx**2 + dy**2)
-    
-    # Calcular distância acumulada
-    cumulative_distance = np.concatenate(([0], np.cumsum(distances)))
-    
     # Criar figura
     plt.figure(figsize=(14, 6), dpi=100)
     
@@ -396,11 +532,11 @@ def create_elevation_profile(df, race_name, session_name, output_path):
     plt.tight_layout()
     
     # Salvar a visualização
-    plt.savefig(output_path, dpi=DPI)
+    plt.savefig(output_path, dpi=dpi, pil_kwargs=PNG_OPTIONS)
     print(f"Perfil de elevação salvo em: {output_path}")
     plt.close()
 
-def create_combined_visualization(df, race_name, session_name, output_path, cmap=DEFAULT_CMAP):
+def create_combined_visualization(df, race_name, session_name, output_path, cmap=DEFAULT_CMAP, dpi=DPI):
     """
     Cria uma visualização combinada com traçado 2D, 3D e perfil de elevação.
     
@@ -410,20 +546,25 @@ def create_combined_visualization(df, race_name, session_name, output_path, cmap
         session_name: Nome da sessão para o título
         output_path: Caminho para salvar a visualização
         cmap: Mapa de cores a ser usado
+        dpi: Resolução da imagem salva
     """
     # Criar figura com três subplots
     fig = plt.figure(figsize=(20, 15), dpi=100)
     gs = gridspec.GridSpec(2, 2, height_ratios=[2, 1])
     
+    # Pontos amostrados para os gráficos de dispersão
+    points = decimate_track_data(df)
+    
     # 1. Traçado 2D (superior esquerdo)
     ax1 = plt.subplot(gs[0, 0])
     scatter1 = ax1.scatter(
-        df['x'], 
-        df['y'],
-        c=df['sequence'],
+        points['x'].to_numpy(dtype=np.float32), 
+        points['y'].to_numpy(dtype=np.float32),
+        c=points['sequence'].to_numpy(),
         cmap=cmap,
         s=SCATTER_SIZES['2d'],
-        alpha=DEFAULT_ALPHA
+        alpha=DEFAULT_ALPHA,
+        rasterized=True
     )
     ax1.set_title(f"2D Track Layout - {race_name}", fontsize=14)
     ax1.set_xlabel("X Coordinate", fontsize=12)
@@ -433,15 +574,7 @@ def create_combined_visualization(df, race_name, session_name, output_path, cmap
     
     # 2. Traçado 3D (superior direito)
     ax2 = plt.subplot(gs[0, 1], projection='3d')
-    scatter2 = ax2.scatter(
-        df['x'],
-        df['y'],
-        df['z'],
-        c=df['sequence'],
-        cmap=cmap,
-        s=SCATTER_SIZES['3d'],
-        alpha=DEFAULT_ALPHA
-    )
+    scatter2 = add_track_lines_3d(ax2, df, cmap)
     ax2.set_title(f"3D Track Layout", fontsize=14)
     ax2.set_xlabel("X Coordinate", fontsize=12)
     ax2.set_ylabel("Y Coordinate", fontsize=12)
@@ -452,20 +585,9 @@ def create_combined_visualization(df, race_name, session_name, output_path, cmap
     ax3 = plt.subplot(gs[1, :])
     
     # Calcular a distância acumulada ao longo do traçado
-    x = df['x'].values
-    y = df['y'].values
+    cumulative_distance = compute_track_distance(df['x'].values, df['y'].values)
     z = df['z'].values
     
-    # Calcular diferenças entre pontos consecutivos
-    dx = np.diff(x)
-    dy = np.diff(y)
-    
-    # Calcular distâncias incrementais (apenas no plano XY)
-    distances = np.sqrt(dx**2 + dy**2)
-    
-    # Calcular distância acumulada
-    cumulative_distance = np.concatenate(([0], np.cumsum(distances)))
-    
     # Plotar o perfil de elevação
     ax3.plot(cumulative_distance, z, 'b-', linewidth=2)
     ax3.set_title(f"Elevation Profile - {session_name}", fontsize=14)
@@ -483,7 +605,7 @@ def create_combined_visualization(df, race_name, session_name, output_path, cmap
     plt.subplots_adjust(wspace=0.3, hspace=0.3)
     
     # Salvar a visualização
-    plt.savefig(output_path, dpi=DPI)
+    plt.savefig(output_path, dpi=dpi, pil_kwargs=PNG_OPTIONS)
     print(f"Visualização combinada salva em: {output_path}")
     plt.close()
 
@@ -498,6 +620,7 @@ def main():
     driver_number = args.driver
     all_drivers = args.all_drivers
     cmap = args.cmap
+    save_dpi = PREVIEW_DPI if args.preview else DPI
     
     # Definir o diretório de saída
     if args.output_dir:
@@ -515,37 +638,47 @@ def main():
     
     try:
         # Carregar dados
-        df = load_position_data(meeting_key, session_key)
-        
-        # Se solicitado, criar visualização para todos os pilotos juntos
-        if all_drivers:
-            full_track_path = output_dir / f"track_all_drivers_{meeting_key}_{session_key}.png"
-            create_multi_driver_visualization(df, race_name, session_name, full_track_path)
-        
-        # Preparar dados do traçado para o piloto específico ou todos
-        track_df = prepare_track_data(df, driver_number)
-        
-        # Limpar e preparar dados
-        track_df = clean_track_data(track_df)
-        
-        # Definir o sufixo para nomes de arquivo
-        driver_suffix = f"_driver_{driver_number}" if driver_number else ""
-        
-        # Criar visualizações
-        if not args.three_d_only:
-            # Visualização 2D
-            track_2d_path = output_dir / f"track_2d{driver_suffix}_{meeting_key}_{session_key}.png"
-            create_2d_track_visualization(track_df, race_name, session_name, track_2d_path, cmap)
-        
-        if not args.two_d_only:
-            # Visualização 3D
-            track_3d_path = output_dir / f"track_3d{driver_suffix}_{meeting_key}_{session_key}.png"
-            create_3d_track_visualization(track_df, race_name, session_name, track_3d_path, cmap)
+        # Sem o gráfico multi-piloto, só as linhas do piloto escolhido são necessárias
+        driver_filter = driver_number if driver_number and not all_drivers else None
+        df = load_position_data(meeting_key, session_key, driver_filter)
         
-        # Perfil de elevação
-        if not args.two_d_only:
-            elevation_path = output_dir / f"elevation_profile{driver_suffix}_{meeting_key}_{session_key}.png"
-            create_elevation_profile(track_df, race_name, session_name, elevation_path)
+        # Gráficos independentes: cada um é gerado em um processo separado
+        # (o pyplot não é thread-safe e o desenho é limitado pela GIL)
+        with ProcessPoolExecutor(max_workers=min(MAX_CHART_WORKERS, os.cpu_count() or 1)) as executor:
+            futures = []
+            
+            # Se solicitado, criar visualização para todos os pilotos juntos
+            if all_drivers:
+                full_track_path = output_dir / f"track_all_drivers_{meeting_key}_{session_key}.png"
+                futures.append(executor.submit(create_multi_driver_visualization, df, race_name, session_name, full_track_path, save_dpi))
+            
+            # Preparar dados do traçado para o piloto específico ou todos
+            track_df = prepare_track_data(df, driver_number)
+            
+            # Limpar e preparar dados
+            track_df = clean_track_data(track_df)
+            
+            # Definir o sufixo para nomes de arquivo
+            driver_suffix = f"_driver_{driver_number}" if driver_number else ""
+            
+            # Criar visualizações
+            if not args.three_d_only:
+                # Visualização 2D
+                track_2d_path = output_dir / f"track_2d{driver_suffix}_{meeting_key}_{session_key}.png"
+                futures.append(executor.submit(create_2d_track_visualization, track_df, race_name, session_name, track_2d_path, cmap, save_dpi))
+            
+            if not args.two_d_only:
+                # Visualização 3D
+                track_3d_path = output_dir / f"track_3d{driver_suffix}_{meeting_key}_{session_key}.png"
+                futures.append(executor.submit(create_3d_track_visualization, track_df, race_name, session_name, track_3d_path, cmap, save_dpi))
+            
+            # Perfil de elevação
+            if not args.two_d_only:
+                elevation_path = output_dir / f"elevation_profile{driver_suffix}_{meeting_key}_{session_key}.png"
+                futures.append(executor.submit(create_elevation_profile, track_df, race_name, session_name, elevation_path, save_dpi))
+            
+            for future in futures:
+                future.result()
         
         # Remover a visualização combinada conforme solicitado
     # A visualização combinada foi removida para manter apenas gráficos individuais
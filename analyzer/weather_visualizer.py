@@ -13,8 +13,12 @@ import os
 import argparse
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Renderização sem interface gráfica
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from concurrent.futures import ThreadPoolExecutor
+from matplotlib.figure import Figure
 from pathlib import Path
 from datetime import datetime, timedelta
 from matplotlib.gridspec import GridSpec
@@ -22,6 +26,10 @@ from matplotlib.gridspec import GridSpec
 # Constantes e configurações
 FIG_SIZE = (16, 10)  # Tamanho padrão para gráficos
 DPI = 300  # Resolução para salvar imagens
+PNG_OPTIONS = {'compress_level': 1}  # Compressão PNG rápida (arquivos um pouco maiores)
+
+# Colunas numéricas do WeatherData (convertidas para float32 ao carregar)
+WEATHER_NUMERIC_COLUMNS = ['AirTemp', 'Humidity', 'Pressure', 'Rainfall', 'TrackTemp', 'WindDirection', 'WindSpeed']
 
 # Cores para diferentes métricas
 COLORS = {
@@ -88,6 +96,11 @@ def load_weather_data(meeting_key, session_key):
             print(f"Aviso: Arquivo de dados meteorológicos vazio: {weather_file}")
             return None
         
+        # Métricas com resolução de 0.1 - float32 basta e reduz a memória pela metade
+        for col in WEATHER_NUMERIC_COLUMNS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+        
         # Padronizar nomes de colunas (podem variar dependendo da fonte)
         column_mapping = {
             'AirTemp': 'air_temp',
@@ -119,7 +132,12 @@ def load_weather_data(meeting_key, session_key):
                     else:
                         # Apenas tempo, adicionar data fictícia para plotagem
                         base_date = '2023-01-01 '  # Data fictícia
-                        df['datetime'] = pd.to_datetime(base_date + df['timestamp'])
+                        try:
+                            df['datetime'] = pd.to_datetime(base_date + df['timestamp'], format='%Y-%m-%d %H:%M:%S.%f')
+                        except ValueError:
+                            # Linhas sem milissegundos ou mal formadas: usar apenas HH:MM:SS
+                            seconds = df['timestamp'].str.partition('.')[0]
+                            df['datetime'] = pd.to_datetime(base_date + seconds, format='%Y-%m-%d %H:%M:%S', errors='coerce')
             except Exception as e:
                 print(f"Aviso: Não foi possível converter timestamps para datetime: {str(e)}")
         
@@ -152,24 +170,23 @@ def create_temperature_chart(weather_df, race_name, session_name, output_path, d
         print(f"Aviso: Dados de temperatura não contêm colunas necessárias: {missing_columns}")
         return
     
-    # Configurar tema escuro se solicitado
+    # Cores do tema (o estilo do matplotlib é aplicado uma vez em main)
     if dark_mode:
-        plt.style.use('dark_background')
         text_color = 'white'
         grid_color = 'gray'
         bg_color = '#333333'
     else:
-        plt.style.use('default')
         text_color = 'black'
         grid_color = 'lightgray'
         bg_color = 'white'
     
     # Criar figura
-    plt.figure(figsize=FIG_SIZE, dpi=100)
+    fig = Figure(figsize=FIG_SIZE, dpi=100)
+    ax = fig.subplots()
     
     # Determinar eixo X (tempo)
     if 'datetime' in weather_df.columns:
-        x = weather_df['datetime']
+        x = weather_df['datetime'].to_numpy()
         x_formatter = mdates.DateFormatter('%H:%M')
         x_label = 'Time'
     else:
@@ -179,34 +196,33 @@ def create_temperature_chart(weather_df, race_name, session_name, output_path, d
         x_label = 'Time (data points)'
     
     # Plotar temperatura do ar
-    plt.plot(x, weather_df['air_temp'], color=COLORS['air_temp'], linewidth=2, label='Air Temperature')
+    ax.plot(x, weather_df['air_temp'].to_numpy(), color=COLORS['air_temp'], linewidth=2, label='Air Temperature')
     
     # Plotar temperatura da pista
-    plt.plot(x, weather_df['track_temp'], color=COLORS['track_temp'], linewidth=2, label='Track Temperature')
+    ax.plot(x, weather_df['track_temp'].to_numpy(), color=COLORS['track_temp'], linewidth=2, label='Track Temperature')
     
     # Configurar eixo X
     if x_formatter:
-        plt.gca().xaxis.set_major_formatter(x_formatter)
-        plt.gcf().autofmt_xdate()
+        ax.xaxis.set_major_formatter(x_formatter)
+        fig.autofmt_xdate()
     
     # Configurar título e rótulos
-    plt.title(f"Temperature Data - {race_name} - {session_name}", fontsize=14, color=text_color)
-    plt.xlabel(x_label, fontsize=12, color=text_color)
-    plt.ylabel('Temperature (°C)', fontsize=12, color=text_color)
+    ax.set_title(f"Temperature Data - {race_name} - {session_name}", fontsize=14, color=text_color)
+    ax.set_xlabel(x_label, fontsize=12, color=text_color)
+    ax.set_ylabel('Temperature (°C)', fontsize=12, color=text_color)
     
     # Adicionar legenda
-    plt.legend()
+    ax.legend()
     
     # Adicionar grade para facilitar a leitura
-    plt.grid(True, alpha=0.3, color=grid_color)
+    ax.grid(True, alpha=0.3, color=grid_color)
     
     # Ajustar layout
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Salvar a visualização
-    plt.savefig(output_path, dpi=DPI, facecolor=bg_color)
+    fig.savefig(output_path, dpi=DPI, facecolor=bg_color, pil_kwargs=PNG_OPTIONS)
     print(f"Visualização de temperatura salva em: {output_path}")
-    plt.close()
 
 def create_humidity_rainfall_chart(weather_df, race_name, session_name, output_path, dark_mode=False):
     """
@@ -228,24 +244,23 @@ def create_humidity_rainfall_chart(weather_df, race_name, session_name, output_p
         print("Aviso: Dados de umidade não disponíveis")
         return
     
-    # Configurar tema escuro se solicitado
+    # Cores do tema (o estilo do matplotlib é aplicado uma vez em main)
     if dark_mode:
-        plt.style.use('dark_background')
         text_color = 'white'
         grid_color = 'gray'
         bg_color = '#333333'
     else:
-        plt.style.use('default')
         text_color = 'black'
         grid_color = 'lightgray'
         bg_color = 'white'
     
     # Criar figura
-    fig, ax1 = plt.subplots(figsize=FIG_SIZE, dpi=100)
+    fig = Figure(figsize=FIG_SIZE, dpi=100)
+    ax1 = fig.subplots()
     
     # Determinar eixo X (tempo)
     if 'datetime' in weather_df.columns:
-        x = weather_df['datetime']
+        x = weather_df['datetime'].to_numpy()
         x_formatter = mdates.DateFormatter('%H:%M')
         x_label = 'Time'
     else:
@@ -255,7 +270,7 @@ def create_humidity_rainfall_chart(weather_df, race_name, session_name, output_p
         x_label = 'Time (data points)'
     
     # Plotar umidade no eixo principal
-    ax1.plot(x, weather_df['humidity'], color=COLORS['humidity'], linewidth=2, label='Humidity')
+    ax1.plot(x, weather_df['humidity'].to_numpy(), color=COLORS['humidity'], linewidth=2, label='Humidity')
     ax1.set_ylabel('Humidity (%)', fontsize=12, color=COLORS['humidity'])
     ax1.tick_params(axis='y', labelcolor=COLORS['humidity'])
     
@@ -273,7 +288,7 @@ def create_humidity_rainfall_chart(weather_df, race_name, session_name, output_p
             ax2.axhline(y=0, color=COLORS['rainfall'], linewidth=1, linestyle='--', label='Rainfall (None)')
             max_rainfall = 1  # Valor arbitrário para escala
         else:
-            ax2.plot(x, weather_df['rainfall'], color=COLORS['rainfall'], linewidth=2, label='Rainfall')
+            ax2.plot(x, weather_df['rainfall'].to_numpy(), color=COLORS['rainfall'], linewidth=2, label='Rainfall')
             max_rainfall = weather_df['rainfall'].max() * 1.1  # 10% a mais para margem
         
         ax2.set_ylabel('Rainfall (mm)', fontsize=12, color=COLORS['rainfall'])
@@ -296,12 +311,11 @@ def create_humidity_rainfall_chart(weather_df, race_name, session_name, output_p
     ax1.grid(True, alpha=0.3, color=grid_color)
     
     # Ajustar layout
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Salvar a visualização
-    plt.savefig(output_path, dpi=DPI, facecolor=bg_color)
+    fig.savefig(output_path, dpi=DPI, facecolor=bg_color, pil_kwargs=PNG_OPTIONS)
     print(f"Visualização de umidade/precipitação salva em: {output_path}")
-    plt.close()
 
 def create_wind_chart(weather_df, race_name, session_name, output_path, dark_mode=False):
     """
@@ -323,24 +337,23 @@ def create_wind_chart(weather_df, race_name, session_name, output_path, dark_mod
         print("Aviso: Dados de velocidade do vento não disponíveis")
         return
     
-    # Configurar tema escuro se solicitado
+    # Cores do tema (o estilo do matplotlib é aplicado uma vez em main)
     if dark_mode:
-        plt.style.use('dark_background')
         text_color = 'white'
         grid_color = 'gray'
         bg_color = '#333333'
     else:
-        plt.style.use('default')
         text_color = 'black'
         grid_color = 'lightgray'
         bg_color = 'white'
     
     # Criar figura
-    fig, ax1 = plt.subplots(figsize=FIG_SIZE, dpi=100)
+    fig = Figure(figsize=FIG_SIZE, dpi=100)
+    ax1 = fig.subplots()
     
     # Determinar eixo X (tempo)
     if 'datetime' in weather_df.columns:
-        x = weather_df['datetime']
+        x = weather_df['datetime'].to_numpy()
         x_formatter = mdates.DateFormatter('%H:%M')
         x_label = 'Time'
     else:
@@ -350,7 +363,7 @@ def create_wind_chart(weather_df, race_name, session_name, output_path, dark_mod
         x_label = 'Time (data points)'
     
     # Plotar velocidade do vento no eixo principal
-    ax1.plot(x, weather_df['wind_speed'], color=COLORS['wind_speed'], linewidth=2, label='Wind Speed')
+    ax1.plot(x, weather_df['wind_speed'].to_numpy(), color=COLORS['wind_speed'], linewidth=2, label='Wind Speed')
     ax1.set_ylabel('Wind Speed (km/h)', fontsize=12, color=COLORS['wind_speed'])
     ax1.tick_params(axis='y', labelcolor=COLORS['wind_speed'])
     
@@ -362,7 +375,7 @@ def create_wind_chart(weather_df, race_name, session_name, output_path, dark_mod
     # Se temos dados de direção do vento, plotar no eixo secundário
     if 'wind_direction' in weather_df.columns:
         ax2 = ax1.twinx()
-        ax2.plot(x, weather_df['wind_direction'], color=COLORS['wind_direction'], linewidth=2, label='Wind Direction')
+        ax2.plot(x, weather_df['wind_direction'].to_numpy(), color=COLORS['wind_direction'], linewidth=2, label='Wind Direction')
         ax2.set_ylabel('Wind Direction (degrees)', fontsize=12, color=COLORS['wind_direction'])
         ax2.tick_params(axis='y', labelcolor=COLORS['wind_direction'])
         
@@ -387,12 +400,11 @@ def create_wind_chart(weather_df, race_name, session_name, output_path, dark_mod
     ax1.grid(True, alpha=0.3, color=grid_color)
     
     # Ajustar layout
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Salvar a visualização
-    plt.savefig(output_path, dpi=DPI, facecolor=bg_color)
+    fig.savefig(output_path, dpi=DPI, facecolor=bg_color, pil_kwargs=PNG_OPTIONS)
     print(f"Visualização de vento salva em: {output_path}")
-    plt.close()
 
 def create_weather_summary(weather_df, race_name, session_name, output_path, dark_mode=False):
     """
@@ -409,25 +421,23 @@ def create_weather_summary(weather_df, race_name, session_name, output_path, dar
         print("Aviso: Dados insuficientes para resumo meteorológico")
         return
     
-    # Configurar tema escuro se solicitado
+    # Cores do tema (o estilo do matplotlib é aplicado uma vez em main)
     if dark_mode:
-        plt.style.use('dark_background')
         text_color = 'white'
         grid_color = 'gray'
         bg_color = '#333333'
     else:
-        plt.style.use('default')
         text_color = 'black'
         grid_color = 'lightgray'
         bg_color = 'white'
     
     # Criar figura com grid para subplots
-    fig = plt.figure(figsize=(16, 12), dpi=100)
+    fig = Figure(figsize=(16, 12), dpi=100)
     gs = GridSpec(3, 2, figure=fig)
     
     # Determinar eixo X (tempo) comum
     if 'datetime' in weather_df.columns:
-        x = weather_df['datetime']
+        x = weather_df['datetime'].to_numpy()
         x_formatter = mdates.DateFormatter('%H:%M')
         x_label = 'Time'
     else:
@@ -439,9 +449,9 @@ def create_weather_summary(weather_df, race_name, session_name, output_path, dar
     # 1. Gráfico de temperatura (ocupando a primeira linha inteira)
     ax1 = fig.add_subplot(gs[0, :])
     if 'air_temp' in weather_df.columns:
-        ax1.plot(x, weather_df['air_temp'], color=COLORS['air_temp'], linewidth=2, label='Air Temperature')
+        ax1.plot(x, weather_df['air_temp'].to_numpy(), color=COLORS['air_temp'], linewidth=2, label='Air Temperature')
     if 'track_temp' in weather_df.columns:
-        ax1.plot(x, weather_df['track_temp'], color=COLORS['track_temp'], linewidth=2, label='Track Temperature')
+        ax1.plot(x, weather_df['track_temp'].to_numpy(), color=COLORS['track_temp'], linewidth=2, label='Track Temperature')
     ax1.set_title('Temperature', fontsize=12, color=text_color)
     ax1.set_ylabel('Temperature (°C)', fontsize=10, color=text_color)
     ax1.grid(True, alpha=0.3, color=grid_color)
@@ -452,7 +462,7 @@ def create_weather_summary(weather_df, race_name, session_name, output_path, dar
     # 2. Gráfico de umidade
     ax2 = fig.add_subplot(gs[1, 0])
     if 'humidity' in weather_df.columns:
-        ax2.plot(x, weather_df['humidity'], color=COLORS['humidity'], linewidth=2)
+        ax2.plot(x, weather_df['humidity'].to_numpy(), color=COLORS['humidity'], linewidth=2)
         ax2.set_title('Humidity', fontsize=12, color=text_color)
         ax2.set_ylabel('Humidity (%)', fontsize=10, color=text_color)
         ax2.grid(True, alpha=0.3, color=grid_color)
@@ -467,7 +477,7 @@ def create_weather_summary(weather_df, race_name, session_name, output_path, dar
             ax3.axhline(y=0, color=COLORS['rainfall'], linewidth=1, linestyle='--')
             max_rainfall = 1  # Valor arbitrário para escala
         else:
-            ax3.plot(x, weather_df['rainfall'], color=COLORS['rainfall'], linewidth=2)
+            ax3.plot(x, weather_df['rainfall'].to_numpy(), color=COLORS['rainfall'], linewidth=2)
             max_rainfall = weather_df['rainfall'].max() * 1.1  # 10% a mais para margem
         
         ax3.set_title('Rainfall', fontsize=12, color=text_color)
@@ -480,7 +490,7 @@ def create_weather_summary(weather_df, race_name, session_name, output_path, dar
     # 4. Gráfico de velocidade do vento
     ax4 = fig.add_subplot(gs[2, 0])
     if 'wind_speed' in weather_df.columns:
-        ax4.plot(x, weather_df['wind_speed'], color=COLORS['wind_speed'], linewidth=2)
+        ax4.plot(x, weather_df['wind_speed'].to_numpy(), color=COLORS['wind_speed'], linewidth=2)
         ax4.set_title('Wind Speed', fontsize=12, color=text_color)
         ax4.set_ylabel('Wind Speed (km/h)', fontsize=10, color=text_color)
         ax4.set_xlabel(x_label, fontsize=10, color=text_color)
@@ -491,7 +501,7 @@ def create_weather_summary(weather_df, race_name, session_name, output_path, dar
     # 5. Gráfico de direção do vento
     ax5 = fig.add_subplot(gs[2, 1])
     if 'wind_direction' in weather_df.columns:
-        ax5.plot(x, weather_df['wind_direction'], color=COLORS['wind_direction'], linewidth=2)
+        ax5.plot(x, weather_df['wind_direction'].to_numpy(), color=COLORS['wind_direction'], linewidth=2)
         ax5.set_title('Wind Direction', fontsize=12, color=text_color)
         ax5.set_ylabel('Wind Direction', fontsize=10, color=text_color)
         ax5.set_xlabel(x_label, fontsize=10, color=text_color)
@@ -507,12 +517,11 @@ def create_weather_summary(weather_df, race_name, session_name, output_path, dar
     fig.suptitle(f"Weather Summary - {race_name} - {session_name}", fontsize=16, color=text_color)
     
     # Ajustar layout
-    plt.tight_layout(rect=[0, 0, 1, 0.96])  # Ajustar para deixar espaço para o título geral
+    fig.tight_layout(rect=[0, 0, 1, 0.96])  # Ajustar para deixar espaço para o título geral
     
     # Salvar a visualização
-    plt.savefig(output_path, dpi=DPI, facecolor=bg_color)
+    fig.savefig(output_path, dpi=DPI, facecolor=bg_color, pil_kwargs=PNG_OPTIONS)
     print(f"Visualização de resumo meteorológico salva em: {output_path}")
-    plt.close()
 
 def create_temperature_comparison(weather_dfs, race_name, session_names, output_path, dark_mode=False):
     """
@@ -529,20 +538,19 @@ def create_temperature_comparison(weather_dfs, race_name, session_names, output_
         print("Aviso: Nenhum dado disponível para comparação de temperatura")
         return
     
-    # Configurar tema escuro se solicitado
+    # Cores do tema (o estilo do matplotlib é aplicado uma vez em main)
     if dark_mode:
-        plt.style.use('dark_background')
         text_color = 'white'
         grid_color = 'gray'
         bg_color = '#333333'
     else:
-        plt.style.use('default')
         text_color = 'black'
         grid_color = 'lightgray'
         bg_color = 'white'
     
     # Criar figura
-    plt.figure(figsize=FIG_SIZE, dpi=100)
+    fig = Figure(figsize=FIG_SIZE, dpi=100)
+    ax = fig.subplots()
     
     # Cores para diferentes sessões
     session_colors = ['blue', 'red', 'green', 'orange', 'purple', 'cyan']
@@ -553,26 +561,25 @@ def create_temperature_comparison(weather_dfs, race_name, session_names, output_
             # Normalizar o eixo X para percentual da sessão
             x = np.linspace(0, 100, len(df))
             color = session_colors[i % len(session_colors)]
-            plt.plot(x, df['air_temp'], color=color, linewidth=2, label=f'{session_name} - Air')
+            ax.plot(x, df['air_temp'].to_numpy(), color=color, linewidth=2, label=f'{session_name} - Air')
     
     # Configurar título e rótulos
-    plt.title(f"Temperature Comparison - {race_name}", fontsize=14, color=text_color)
-    plt.xlabel('Session Progress (%)', fontsize=12, color=text_color)
-    plt.ylabel('Temperature (°C)', fontsize=12, color=text_color)
+    ax.set_title(f"Temperature Comparison - {race_name}", fontsize=14, color=text_color)
+    ax.set_xlabel('Session Progress (%)', fontsize=12, color=text_color)
+    ax.set_ylabel('Temperature (°C)', fontsize=12, color=text_color)
     
     # Adicionar legenda
-    plt.legend()
+    ax.legend()
     
     # Adicionar grade para facilitar a leitura
-    plt.grid(True, alpha=0.3, color=grid_color)
+    ax.grid(True, alpha=0.3, color=grid_color)
     
     # Ajustar layout
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Salvar a visualização
-    plt.savefig(output_path, dpi=DPI, facecolor=bg_color)
+    fig.savefig(output_path, dpi=DPI, facecolor=bg_color, pil_kwargs=PNG_OPTIONS)
     print(f"Visualização de comparação de temperatura salva em: {output_path}")
-    plt.close()
 
 def main():
     """Função principal do script."""
@@ -607,18 +614,25 @@ def main():
             print("Erro: Não foi possível carregar dados meteorológicos")
             return 1
         
-        # Criar visualizações individuais
-        temp_path = output_dir / f"temperature_{meeting_key}_{session_key}.png"
-        create_temperature_chart(weather_df, race_name, session_name, temp_path, dark_mode)
-        
-        humidity_path = output_dir / f"humidity_rainfall_{meeting_key}_{session_key}.png"
-        create_humidity_rainfall_chart(weather_df, race_name, session_name, humidity_path, dark_mode)
+        # Aplicar o estilo uma única vez, antes de criar os gráficos: plt.style.use altera
+        # o rcParams global, que não pode ser modificado enquanto as threads desenham
+        plt.style.use('dark_background' if dark_mode else 'default')
         
-        wind_path = output_dir / f"wind_{meeting_key}_{session_key}.png"
-        create_wind_chart(weather_df, race_name, session_name, wind_path, dark_mode)
+        # Criar visualizações individuais em paralelo (cada gráfico usa sua própria Figure)
+        chart_jobs = [
+            (create_temperature_chart, output_dir / f"temperature_{meeting_key}_{session_key}.png"),
+            (create_humidity_rainfall_chart, output_dir / f"humidity_rainfall_{meeting_key}_{session_key}.png"),
+            (create_wind_chart, output_dir / f"wind_{meeting_key}_{session_key}.png"),
+            (create_weather_summary, output_dir / f"weather_summary_{meeting_key}_{session_key}.png")
+        ]
         
-        summary_path = output_dir / f"weather_summary_{meeting_key}_{session_key}.png"
-        create_weather_summary(weather_df, race_name, session_name, summary_path, dark_mode)
+        with ThreadPoolExecutor(max_workers=len(chart_jobs)) as executor:
+            futures = [
+                executor.submit(chart_fn, weather_df, race_name, session_name, chart_path, dark_mode)
+                for chart_fn, chart_path in chart_jobs
+            ]
+            for future in futures:
+                future.result()
         
         # Se houver sessões para comparar, criar visualização comparativa
         if compare_sessions:
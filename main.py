@@ -126,6 +126,7 @@ def run_processor(processor_class, meeting_key, session_key):
     Returns:
         dict: Resultados do processamento
     """
+    processor = None
     try:
         processor = processor_class()
         result = processor.process(meeting_key, session_key)
@@ -133,6 +134,10 @@ def run_processor(processor_class, meeting_key, session_key):
     except Exception as e:
         print(f"Erro ao executar o processador {processor_class.__name__}: {str(e)}")
         return None
+    finally:
+        # Liberar conexões abertas pelo processador
+        if processor is not None:
+            processor.close()
 
 def detect_available_topics(meeting_key, session_key):
     """
@@ -1,15 +1,28 @@
 """
 Base Processor class with common functionality for all data processors.
 Updated to work with key-based folder structure.
+
+CSV files are written with pyarrow when it is installed, without quoting. Frames with
+values that need quoting, or columns pyarrow cannot convert, are written by pandas
+instead. The two writers differ in two details: pyarrow writes booleans as true/false
+and whole floats without a decimal part (1), while pandas writes True/False and 1.0.
 """
-import re
 import json
 import pandas as pd
 from pathlib import Path
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional; fall back to the pandas CSV writer
+    pa = None
+
 import config
 from src.utils.file_utils import ensure_directory
-from src.utils.data_decoders import decode_compressed_data
+from src.utils.data_decoders import decode_compressed_data, decode_json_stream, iter_stream, json_loads
+
+# Rows converted per batch by the pyarrow CSV writer
+CSV_BATCH_SIZE = 65536
 
 
 class BaseProcessor:
@@ -23,27 +36,32 @@ class BaseProcessor:
         self.raw_dir = config.RAW_DATA_DIR
         self.processed_dir = config.PROCESSED_DATA_DIR
     
+    def close(self):
+        """Release resources held by the processor (nothing by default)."""
+        pass
+    
     def extract_timestamped_data(self, file_path):
         """
         Extract timestamped data from a JSON stream file.
         
         Args:
-            file_path: Path to the raw data file
+            file_path: Path to the raw data file, or an open file-like object
+                (text or binary) whose content is already available in memory
             
         Returns:
             list: List of tuples containing (timestamp, data)
         """
         print(f"Processing: {file_path}")
         
-        with open(file_path, 'rb') as f:
-            content = f.read()
-        
-        # Decode the content as UTF-8
-        text = content.decode('utf-8', errors='replace')
-        
-        # Extract timestamp and data using regex
-        pattern = r'(\d{2}:\d{2}:\d{2}\.\d{3})(.*?)(?=\d{2}:\d{2}:\d{2}\.\d{3}|$)'
-        matches = re.findall(pattern, text, re.DOTALL)
+        if hasattr(file_path, 'read'):
+            # Streams (e.g. StringIO/BytesIO) are scanned directly, without touching disk
+            content = file_path.read()
+            if not isinstance(content, str):
+                content = bytes(content).decode('utf-8', errors='replace')
+            matches = list(decode_json_stream(content))
+        else:
+            # Scan the memory-mapped file instead of reading and decoding it whole
+            matches = list(iter_stream(file_path))
         
         print(f"Found {len(matches)} records")
         
@@ -85,7 +103,8 @@ class BaseProcessor:
         
         for i, (timestamp, json_str) in enumerate(timestamped_data):
             try:
-                data = json.loads(json_str)
+                # orjson when installed; its errors subclass json.JSONDecodeError
+                data = json_loads(json_str)
                 parsed_data.append({
                     "timestamp": timestamp,
                     "data": data
@@ -141,6 +160,30 @@ class BaseProcessor:
         
         return file_path
     
+    def write_csv(self, df, file_path):
+        """
+        Write a DataFrame to a CSV file with pyarrow's multithreaded writer,
+        falling back to pandas when pyarrow is missing or cannot convert the columns.
+        
+        Args:
+            df: The DataFrame to write
+            file_path: Path of the output file
+        """
+        if pa is not None:
+            try:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                write_options = pacsv.WriteOptions(include_header=False, batch_size=CSV_BATCH_SIZE, quoting_style='none')
+                with open(file_path, 'wb') as f:
+                    # Header from pandas so column names are quoted the same way in both writers
+                    f.write(df.head(0).to_csv(index=False).encode('utf-8'))
+                    pacsv.write_csv(table, f, write_options=write_options)
+                return
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                # Nested objects (dicts, lists) and values that need quoting are left to pandas
+                pass
+        
+        df.to_csv(file_path, index=False)
+    
     def save_to_csv(self, df, meeting_key, session_key, topic_name, file_name, race_name=None, session_name=None):
         """
         Save a DataFrame to a CSV file using key-based folder structure.
@@ -169,7 +212,7 @@ class BaseProcessor:
         df = self.ensure_timestamp_first(df)
         
         file_path = output_dir / file_name
-        df.to_csv(file_path, index=False)
+        self.write_csv(df, file_path)
         
         # Display info with race/session names if provided, otherwise use keys
         display_info = f"{race_name}/{session_name}" if race_name and session_name else f"Meeting {meeting_key}/Session {session_key}"
@@ -177,6 +220,47 @@ class BaseProcessor:
         
         return file_path
     
+    def save_to_parquet(self, df, meeting_key, session_key, topic_name, file_name, race_name=None, session_name=None, row_group_size=None):
+        """
+        Save a DataFrame to a zstd-compressed Parquet file using key-based folder structure.
+        
+        Args:
+            df: The DataFrame to save
+            meeting_key: Meeting key (race key)
+            session_key: Session key
+            topic_name: Name of the data topic
+            file_name: Name of the output file
+            race_name: Optional race name for logging (default: None)
+            session_name: Optional session name for logging (default: None)
+            row_group_size: Optional maximum rows per row group (default: pyarrow's)
+            
+        Returns:
+            Path: Path to the saved Parquet file, or None if pyarrow is not installed
+        """
+        if pa is None:
+            print(f"pyarrow not installed; skipping Parquet file {file_name}")
+            return None
+        
+        # Convert keys to strings for path construction
+        meeting_key_str = str(meeting_key)
+        session_key_str = str(session_key)
+        
+        # Create output directory path with key-based structure
+        output_dir = self.processed_dir / meeting_key_str / session_key_str / topic_name
+        ensure_directory(output_dir)
+        
+        # Ensure timestamp is the first column
+        df = self.ensure_timestamp_first(df)
+        
+        file_path = output_dir / file_name
+        df.to_parquet(file_path, compression='zstd', index=False, row_group_size=row_group_size)
+        
+        # Display info with race/session names if provided, otherwise use keys
+        display_info = f"{race_name}/{session_name}" if race_name and session_name else f"Meeting {meeting_key}/Session {session_key}"
+        print(f"Parquet data saved to {file_path} ({display_info})")
+        
+        return file_path
+    
     def get_raw_file_path(self, meeting_key, session_key, topic_name):
         """
         Get the path to a raw data file using key-based folder structure.
@@ -283,7 +367,7 @@ class BaseProcessor:
         df = self.ensure_timestamp_first(df)
         
         file_path = output_dir / file_name
-        df.to_csv(file_path, index=False)
+        self.write_csv(df, file_path)
         
         print(f"CSV data saved to {file_path} (using legacy path structure)")
         
@@ -24,6 +24,10 @@ load_dotenv()
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
 
+# Rows per Parquet row group; with the file sorted by driver each group covers
+# only one or two drivers, so a driver filter can skip the rest
+PARQUET_ROW_GROUP_ROWS = 16384
+
 class CarDataProcessor(BaseProcessor):
     """
     Process CarData.z compressed streams to extract telemetry data and store in database.
@@ -370,6 +374,21 @@ class CarDataProcessor(BaseProcessor):
         )
         results["car_data_file"] = csv_path
         
+        # Columnar copy for downstream readers (the telemetry visualizer reads one driver from it),
+        # sorted by driver so the row group statistics can prune the other drivers
+        parquet_path = self.save_to_parquet(
+            df_car_data.sort_values('driver_number', kind='stable'),
+            meeting_key,
+            session_key,
+            self.topic_name,
+            "car_data.parquet",
+            race_name,
+            session_name,
+            row_group_size=PARQUET_ROW_GROUP_ROWS
+        )
+        if parquet_path:
+            results["car_data_parquet_file"] = parquet_path
+        
         # Split data by driver for easier analysis
         driver_dir = self.get_processed_dir(meeting_key, session_key, self.topic_name) / "drivers"
         driver_dir.mkdir(exist_ok=True, parents=True)
@@ -10,6 +10,7 @@ from datetime import datetime
 
 from src.processors.base_processor import BaseProcessor
 from src.utils.file_utils import ensure_directory
+from src.utils.time_utils import timestamps_to_datetime
 
 
 class PitLaneProcessor(BaseProcessor):
@@ -109,8 +110,8 @@ class PitLaneProcessor(BaseProcessor):
         if deletions:
             deletion_df = pd.DataFrame(deletions)
             # Convert timestamps to datetime for better comparison
-            pit_df['datetime'] = pd.to_datetime(pit_df['timestamp'], format='%H:%M:%S.%f', errors='coerce')
-            deletion_df['datetime'] = pd.to_datetime(deletion_df['timestamp'], format='%H:%M:%S.%f', errors='coerce')
+            pit_df['datetime'] = timestamps_to_datetime(pit_df['timestamp'])
+            deletion_df['datetime'] = timestamps_to_datetime(deletion_df['timestamp'])
             
             # For each driver, remove entries that were deleted
             # (entries before deletion timestamp that match the driver)
@@ -1,6 +1,7 @@
 """
 Processor for TimingAppData streams from F1 races.
 """
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
@@ -13,10 +14,16 @@ class TimingAppProcessor(BaseProcessor):
     Process TimingAppData streams to extract tire strategy and stint information.
     """
     
-    def __init__(self):
-        """Initialize the TimingAppData processor."""
+    def __init__(self, emit_raw=False):
+        """
+        Initialize the TimingAppData processor.
+        
+        Args:
+            emit_raw: Also save every tire stint update to tire_stints_raw.parquet (default: False)
+        """
         super().__init__()
         self.topic_name = "TimingAppData"
+        self.emit_raw = emit_raw
     
     def extract_tire_data(self, parsed_data):
         """
@@ -26,11 +33,17 @@ class TimingAppProcessor(BaseProcessor):
             parsed_data: List of dictionaries containing parsed data with timestamps
             
         Returns:
-            tuple: (driver_positions, tire_stints)
+            tuple: (driver_positions, tire_stints), where driver_positions is a DataFrame
         """
-        driver_positions = []
         tire_stints = []
         
+        # Preallocate the position columns (upper bound: a full grid in every entry)
+        capacity = len(parsed_data) * 22
+        pos_timestamps = np.empty(capacity, dtype='U15')
+        pos_drivers = np.empty(capacity, dtype=np.int16)
+        pos_values = np.empty(capacity, dtype=np.int8)
+        cursor = 0
+        
         # Process each parsed entry
         for entry in parsed_data:
             timestamp = entry["timestamp"]
@@ -44,44 +57,45 @@ class TimingAppProcessor(BaseProcessor):
                     
                     # Extract position
                     if "Line" in driver_info:
-                        position = driver_info["Line"]
-                        driver_positions.append({
-                            "timestamp": timestamp,
-                            "driver_number": driver_number,
-                            "grid_position": position
-                        })
+                        if cursor == capacity:
+                            capacity *= 2
+                            pos_timestamps = np.resize(pos_timestamps, capacity)
+                            pos_drivers = np.resize(pos_drivers, capacity)
+                            pos_values = np.resize(pos_values, capacity)
+                        pos_timestamps[cursor] = timestamp
+                        pos_drivers[cursor] = int(driver_number)
+                        pos_values[cursor] = int(driver_info["Line"])
+                        cursor += 1
                     
                     # Extract stint/tire information
                     if "Stints" in driver_info:
                         stints = driver_info["Stints"]
                         
-                        # Process stints (both as dictionary and as list)
+                        # Stints arrive either as a dictionary keyed by index or as a list
                         if isinstance(stints, dict):
-                            for stint_idx, stint_data in stints.items():
-                                if isinstance(stint_data, dict) and "Compound" in stint_data:
-                                    stint_info = {
-                                        "timestamp": timestamp,
-                                        "driver_number": driver_number,
-                                        "stint_number": int(stint_idx) + 1,
-                                        "compound": stint_data["Compound"],
-                                        "new_tire": stint_data.get("New") == "true",
-                                        "total_laps": stint_data.get("TotalLaps", 0),
-                                        "start_laps": stint_data.get("StartLaps", 0)
-                                    }
-                                    tire_stints.append(stint_info)
+                            stint_items = stints.items()
                         elif isinstance(stints, list):
-                            for stint_idx, stint_data in enumerate(stints):
-                                if isinstance(stint_data, dict) and "Compound" in stint_data:
-                                    stint_info = {
-                                        "timestamp": timestamp,
-                                        "driver_number": driver_number,
-                                        "stint_number": stint_idx + 1,
-                                        "compound": stint_data["Compound"],
-                                        "new_tire": stint_data.get("New") == "true",
-                                        "total_laps": stint_data.get("TotalLaps", 0),
-                                        "start_laps": stint_data.get("StartLaps", 0)
-                                    }
-                                    tire_stints.append(stint_info)
+                            stint_items = enumerate(stints)
+                        else:
+                            stint_items = ()
+                        
+                        for stint_idx, stint_data in stint_items:
+                            if isinstance(stint_data, dict) and "Compound" in stint_data:
+                                tire_stints.append({
+                                    "timestamp": timestamp,
+                                    "driver_number": driver_number,
+                                    "stint_number": int(stint_idx) + 1,
+                                    "compound": stint_data["Compound"],
+                                    "new_tire": stint_data.get("New") == "true",
+                                    "total_laps": stint_data.get("TotalLaps", 0),
+                                    "start_laps": stint_data.get("StartLaps", 0)
+                                })
+        
+        driver_positions = pd.DataFrame({
+            "timestamp": pos_timestamps[:cursor],
+            "driver_number": pos_drivers[:cursor],
+            "grid_position": pos_values[:cursor]
+        }, copy=False)
         
         return driver_positions, tire_stints
     
@@ -149,10 +163,9 @@ class TimingAppProcessor(BaseProcessor):
         driver_positions, tire_stints = self.extract_tire_data(parsed_data)
         
         # Save the processed data
-        if driver_positions:
-            df_positions = pd.DataFrame(driver_positions)
+        if not driver_positions.empty:
             file_path = self.save_to_csv(
-                df_positions, 
+                driver_positions, 
                 race_name, 
                 session_name, 
                 self.topic_name, 
@@ -173,16 +186,20 @@ class TimingAppProcessor(BaseProcessor):
             )
             results["tire_stints_file"] = file_path
             
-            # Also save the raw tire stint data
-            raw_stints_df = pd.DataFrame(tire_stints)
-            file_path = self.save_to_csv(
-                raw_stints_df, 
-                race_name, 
-                session_name, 
-                self.topic_name, 
-                "tire_stints_raw.csv"
-            )
-            results["tire_stints_raw_file"] = file_path
+            # Also save the raw tire stint data when requested
+            if self.emit_raw:
+                raw_stints_df = pd.DataFrame(tire_stints)
+                raw_stints_df["compound"] = raw_stints_df["compound"].astype("category")
+                
+                file_path = self.save_to_parquet(
+                    raw_stints_df, 
+                    race_name, 
+                    session_name, 
+                    self.topic_name, 
+                    "tire_stints_raw.parquet"
+                )
+                if file_path:
+                    results["tire_stints_raw_file"] = file_path
         
         print(f"Processed TimingAppData for {race_name}/{session_name}")
         return results
\ No newline at end of file
@@ -1,12 +1,20 @@
 """
 Processor for TimingData streams from F1 races.
 """
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
 from src.processors.base_processor import BaseProcessor
 from src.utils.file_utils import ensure_directory
 
+# Speed measurement points in the feed and the drivers_data column each one fills
+SPEED_TRAPS = (
+    ("I1", "speeds_i1"),
+    ("I2", "speeds_i2"),
+    ("ST", "speeds_st"),
+)
+
 
 class TimingDataProcessor(BaseProcessor):
     """
@@ -26,16 +34,25 @@ class TimingDataProcessor(BaseProcessor):
             parsed_data: List of dictionaries containing parsed data with timestamps
             
         Returns:
-            tuple: (drivers_data, lap_times, sector_times, positions, speeds)
+            tuple: (drivers_data, lap_times, sector_times, positions, speeds),
+                where positions is a DataFrame
         """
         # Data structures to store the extracted information
         drivers_data = {}
         lap_times = []
         sector_times = []
-        positions = []
         speeds = []
         
-        # Process each parsed entry
+        # Preallocate the position columns (upper bound: a full grid in every entry)
+        capacity = len(parsed_data) * 22
+        pos_timestamps = np.empty(capacity, dtype='U15')
+        pos_drivers = np.empty(capacity, dtype=np.int16)
+        pos_values = np.empty(capacity, dtype=np.int8)
+        cursor = 0
+        
+        # First pass: bucket the entries by driver so each driver's stream
+        # is processed contiguously below
+        by_driver = {}
         for entry in parsed_data:
             timestamp = entry["timestamp"]
             data = entry["data"]
@@ -46,125 +63,113 @@ class TimingDataProcessor(BaseProcessor):
                     if not isinstance(driver_info, dict):
                         continue
                     
-                    # Initialize driver data if it doesn't exist
-                    if driver_number not in drivers_data:
-                        drivers_data[driver_number] = {
-                            "timestamps": [],
-                            "positions": [],
-                            "lap_times": [],
-                            "sector1": [],
-                            "sector2": [],
-                            "sector3": [],
-                            "speeds_i1": [],
-                            "speeds_i2": [],
-                            "speeds_st": [],
-                            "in_pit": [],
-                            "pit_out": [],
-                            "laps": []
-                        }
-                    
-                    # Add timestamp
-                    drivers_data[driver_number]["timestamps"].append(timestamp)
-                    
-                    # Extract position
-                    position = driver_info.get("Position")
-                    if position:
-                        drivers_data[driver_number]["positions"].append(position)
-                        positions.append({
+                    if driver_number not in by_driver:
+                        by_driver[driver_number] = []
+                    by_driver[driver_number].append((timestamp, driver_info))
+        
+        # Second pass: fill each driver's columns in one go
+        for driver_number, stream in by_driver.items():
+            cols = {
+                "timestamps": [],
+                "positions": [],
+                "lap_times": [],
+                "sector1": [],
+                "sector2": [],
+                "sector3": [],
+                "speeds_i1": [],
+                "speeds_i2": [],
+                "speeds_st": [],
+                "in_pit": [],
+                "pit_out": [],
+                "laps": []
+            }
+            drivers_data[driver_number] = cols
+            driver_code = int(driver_number)
+            
+            timestamps_append = cols["timestamps"].append
+            positions_append = cols["positions"].append
+            in_pit_append = cols["in_pit"].append
+            pit_out_append = cols["pit_out"].append
+            laps_append = cols["laps"].append
+            
+            for timestamp, driver_info in stream:
+                # Add timestamp
+                timestamps_append(timestamp)
+                
+                # Extract position
+                position = driver_info.get("Position")
+                if position:
+                    positions_append(position)
+                    if cursor == capacity:
+                        capacity *= 2
+                        pos_timestamps = np.resize(pos_timestamps, capacity)
+                        pos_drivers = np.resize(pos_drivers, capacity)
+                        pos_values = np.resize(pos_values, capacity)
+                    pos_timestamps[cursor] = timestamp
+                    pos_drivers[cursor] = driver_code
+                    pos_values[cursor] = int(position)
+                    cursor += 1
+                else:
+                    positions_append(None)
+                
+                # Extract lap times
+                if "LastLapTime" in driver_info and "Value" in driver_info["LastLapTime"]:
+                    lap_time = driver_info["LastLapTime"]["Value"]
+                    if lap_time:
+                        cols["lap_times"].append(lap_time)
+                        lap_times.append({
                             "timestamp": timestamp,
                             "driver_number": driver_number,
-                            "position": position
+                            "lap_time": lap_time,
+                            "fastest": driver_info["LastLapTime"].get("OverallFastest", False),
+                            "personal_fastest": driver_info["LastLapTime"].get("PersonalFastest", False)
                         })
-                    else:
-                        drivers_data[driver_number]["positions"].append(None)
-                    
-                    # Extract lap times
-                    if "LastLapTime" in driver_info and "Value" in driver_info["LastLapTime"]:
-                        lap_time = driver_info["LastLapTime"]["Value"]
-                        if lap_time:
-                            drivers_data[driver_number]["lap_times"].append(lap_time)
-                            lap_times.append({
+                
+                # Extract sector times
+                if "Sectors" in driver_info and isinstance(driver_info["Sectors"], list):
+                    for sector_idx, sector in enumerate(driver_info["Sectors"]):
+                        if isinstance(sector, dict) and "Value" in sector and sector["Value"]:
+                            sector_key = f"sector{sector_idx+1}"
+                            sector_times.append({
                                 "timestamp": timestamp,
                                 "driver_number": driver_number,
-                                "lap_time": lap_time,
-                                "fastest": driver_info["LastLapTime"].get("OverallFastest", False),
-                                "personal_fastest": driver_info["LastLapTime"].get("PersonalFastest", False)
+                                "sector": sector_idx+1,
+                                "time": sector["Value"],
+                                "fastest": sector.get("OverallFastest", False),
+                                "personal_fastest": sector.get("PersonalFastest", False)
                             })
+                            cols[sector_key].append(sector["Value"])
+                
+                # Extract speeds
+                if "Speeds" in driver_info and isinstance(driver_info["Speeds"], dict):
+                    speeds_info = driver_info["Speeds"]
                     
-                    # Extract sector times
-                    if "Sectors" in driver_info and isinstance(driver_info["Sectors"], list):
-                        for sector_idx, sector in enumerate(driver_info["Sectors"]):
-                            if isinstance(sector, dict) and "Value" in sector and sector["Value"]:
-                                sector_key = f"sector{sector_idx+1}"
-                                sector_times.append({
-                                    "timestamp": timestamp,
-                                    "driver_number": driver_number,
-                                    "sector": sector_idx+1,
-                                    "time": sector["Value"],
-                                    "fastest": sector.get("OverallFastest", False),
-                                    "personal_fastest": sector.get("PersonalFastest", False)
-                                })
-                                drivers_data[driver_number][sector_key].append(sector["Value"])
-                    
-                    # Extract speeds
-                    if "Speeds" in driver_info and isinstance(driver_info["Speeds"], dict):
-                        speeds_info = driver_info["Speeds"]
-                        
-                        # Intermediate 1
-                        if "I1" in speeds_info and "Value" in speeds_info["I1"] and speeds_info["I1"]["Value"]:
-                            speed = speeds_info["I1"]["Value"]
-                            drivers_data[driver_number]["speeds_i1"].append(speed)
+                    for trap, column in SPEED_TRAPS:
+                        trap_info = speeds_info.get(trap)
+                        if trap_info and trap_info.get("Value"):
+                            speed = trap_info["Value"]
+                            cols[column].append(speed)
                             speeds.append({
                                 "timestamp": timestamp,
                                 "driver_number": driver_number,
-                                "type": "I1",
+                                "type": trap,
                                 "speed": speed,
-                                "fastest": speeds_info["I1"].get("OverallFastest", False),
-                                "personal_fastest": speeds_info["I1"].get("PersonalFastest", False)
+                                "fastest": trap_info.get("OverallFastest", False),
+                                "personal_fastest": trap_info.get("PersonalFastest", False)
                             })
-                        
-                        # Intermediate 2
-                        if "I2" in speeds_info and "Value" in speeds_info["I2"] and speeds_info["I2"]["Value"]:
-                            speed = speeds_info["I2"]["Value"]
-                            drivers_data[driver_number]["speeds_i2"].append(speed)
-                            speeds.append({
-                                "timestamp": timestamp,
-                                "driver_number": driver_number,
-                                "type": "I2",
-                                "speed": speed,
-                                "fastest": speeds_info["I2"].get("OverallFastest", False),
-                                "personal_fastest": speeds_info["I2"].get("PersonalFastest", False)
-                            })
-                        
-                        # Speed Trap
-                        if "ST" in speeds_info and "Value" in speeds_info["ST"] and speeds_info["ST"]["Value"]:
-                            speed = speeds_info["ST"]["Value"]
-                            drivers_data[driver_number]["speeds_st"].append(speed)
-                            speeds.append({
-                                "timestamp": timestamp,
-                                "driver_number": driver_number,
-                                "type": "ST",
-                                "speed": speed,
-                                "fastest": speeds_info["ST"].get("OverallFastest", False),
-                                "personal_fastest": speeds_info["ST"].get("PersonalFastest", False)
-                            })
-                    
-                    # Pit status
-                    if "InPit" in driver_info:
-                        drivers_data[driver_number]["in_pit"].append(driver_info["InPit"])
-                    else:
-                        drivers_data[driver_number]["in_pit"].append(None)
-                    
-                    if "PitOut" in driver_info:
-                        drivers_data[driver_number]["pit_out"].append(driver_info["PitOut"])
-                    else:
-                        drivers_data[driver_number]["pit_out"].append(None)
-                    
-                    # Lap number
-                    if "NumberOfLaps" in driver_info:
-                        drivers_data[driver_number]["laps"].append(driver_info["NumberOfLaps"])
-                    else:
-                        drivers_data[driver_number]["laps"].append(None)
+                
+                # Pit status
+                in_pit_append(driver_info.get("InPit"))
+                pit_out_append(driver_info.get("PitOut"))
+                
+                # Lap number
+                laps_append(driver_info.get("NumberOfLaps"))
+        
+        positions = pd.DataFrame({
+            "timestamp": pos_timestamps[:cursor],
+            "driver_number": pos_drivers[:cursor],
+            "position": pos_values[:cursor]
+        }, copy=False)
         
         return drivers_data, lap_times, sector_times, positions, speeds
     
@@ -206,10 +211,9 @@ class TimingDataProcessor(BaseProcessor):
         drivers_data, lap_times, sector_times, positions, speeds = self.extract_driver_data(parsed_data)
         
         # Save the processed data to CSV files
-        if positions:
-            df_positions = pd.DataFrame(positions)
+        if not positions.empty:
             file_path = self.save_to_csv(
-                df_positions, 
+                positions, 
                 race_name, 
                 session_name, 
                 self.topic_name, 
@@ -2,16 +2,26 @@
 Processor for WeatherData streams from F1 races.
 Simplified version that only generates CSV and stores data in the database.
 """
+import importlib.util
+import httpx
+import numpy as np
 import pandas as pd
 import json
 import os
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import psycopg
+except ImportError:  # psycopg is optional; without it the REST API is used
+    psycopg = None
 
 from src.processors.base_processor import BaseProcessor
 from src.utils.file_utils import ensure_directory
+from src.utils.data_decoders import json_loads
 
 # Carregar variáveis de ambiente
 load_dotenv()
@@ -20,6 +30,33 @@ load_dotenv()
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
 
+# HTTP/2 multiplexa os lotes numa única conexão quando o pacote h2 está instalado
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Conexão direta opcional ao PostgreSQL (gravação via COPY)
+DATABASE_URL = os.environ.get("DATABASE_URL")
+
+# Numeric measurements in the WeatherData feed
+NUMERIC_COLUMNS = ("AirTemp", "Humidity", "Pressure", "Rainfall", "TrackTemp", "WindDirection", "WindSpeed")
+
+# Feed column -> weather_data table column, in insertion order
+DATABASE_COLUMNS = (
+    ("AirTemp", "air_temp"),
+    ("TrackTemp", "track_temp"),
+    ("Humidity", "humidity"),
+    ("Pressure", "pressure"),
+    ("Rainfall", "rainfall"),
+    ("WindDirection", "wind_direction"),
+    ("WindSpeed", "wind_speed"),
+)
+
+# Inserção em lotes para o Supabase
+DATABASE_BATCH_SIZE = 500
+DATABASE_WORKERS = 4
+
+# Linhas por bloco ao gerar o CSV para o COPY
+COPY_CHUNK_ROWS = 10000
+
 class WeatherDataProcessor(BaseProcessor):
     """
     Simplified Weather Data Processor that focuses on:
@@ -33,7 +70,10 @@ class WeatherDataProcessor(BaseProcessor):
         """Initialize the WeatherData processor."""
         super().__init__()
         self.topic_name = "WeatherData"
+        self.http_client = None
         self.supabase = self._init_supabase()
+        self.db_connection = self._init_direct_connection()
+        self._session_id_cache = {}
     
     def _init_supabase(self):
         """Initialize Supabase client with improved error handling."""
@@ -43,7 +83,22 @@ class WeatherDataProcessor(BaseProcessor):
         
         try:
             print(f"Conectando ao Supabase: {SUPABASE_URL}")
-            client = create_client(SUPABASE_URL, SUPABASE_KEY)
+            
+            # Cliente HTTP compartilhado: os lotes reaproveitam as conexões abertas
+            http_client = httpx.Client(
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                http2=HTTP2_AVAILABLE,
+                timeout=30.0
+            )
+            try:
+                options = ClientOptions(httpx_client=http_client)
+            except TypeError:
+                # Versões antigas do supabase-py não aceitam httpx_client: usar o cliente padrão
+                http_client.close()
+                client = create_client(SUPABASE_URL, SUPABASE_KEY)
+            else:
+                self.http_client = http_client
+                client = create_client(SUPABASE_URL, SUPABASE_KEY, options=options)
             
             # Fazer uma consulta de teste simples para verificar a conexão
             test_result = client.table("races").select("id").limit(1).execute()
@@ -51,11 +106,41 @@ class WeatherDataProcessor(BaseProcessor):
             return client
         except Exception as e:
             print(f"Erro ao inicializar o cliente Supabase: {str(e)}")
+            self._close_http_client()
             return None
 
+    def _init_direct_connection(self):
+        """Open the optional direct PostgreSQL connection used for COPY loads."""
+        if not DATABASE_URL:
+            return None
+        
+        if psycopg is None:
+            print("AVISO: DATABASE_URL configurado, mas o psycopg não está instalado. Usando a API REST do Supabase.")
+            return None
+        
+        try:
+            return psycopg.connect(DATABASE_URL)
+        except Exception as e:
+            print(f"Erro ao conectar diretamente ao banco de dados: {str(e)}")
+            return None
+
+    def close(self):
+        """Close the direct PostgreSQL connection and the shared HTTP client, if open."""
+        if self.db_connection is not None:
+            self.db_connection.close()
+            self.db_connection = None
+        self._close_http_client()
+    
+    def _close_http_client(self):
+        """Close the HTTP client shared with the Supabase client, if one was created."""
+        if self.http_client is not None:
+            self.http_client.close()
+            self.http_client = None
+
     def get_session_id_by_keys(self, meeting_key, session_key):
         """
         Get the session ID from the database based on meeting_key and session_key.
+        Found IDs are cached, so repeated calls for the same keys skip the queries.
         
         Args:
             meeting_key: Key of the meeting (race)
@@ -66,7 +151,34 @@ class WeatherDataProcessor(BaseProcessor):
         """
         if not self.supabase:
             return None
+        
+        cache_key = (str(meeting_key), str(session_key))
+        if cache_key in self._session_id_cache:
+            return self._session_id_cache[cache_key]
+        
+        session_id = self._lookup_session_id(meeting_key, session_key)
+        
+        # Não guardar falhas: a sessão pode ser cadastrada depois
+        if session_id is not None:
+            self._session_id_cache[cache_key] = session_id
+        
+        return session_id
+    
+    def clear_session_cache(self):
+        """Forget the session IDs cached by get_session_id_by_keys."""
+        self._session_id_cache.clear()
+    
+    def _lookup_session_id(self, meeting_key, session_key):
+        """
+        Query the database for the session ID of meeting_key/session_key.
+        
+        Args:
+            meeting_key: Key of the meeting (race)
+            session_key: Key of the session
             
+        Returns:
+            int: Session ID or None if not found
+        """
         try:
             # Primeiro, tente buscar diretamente pela chave da sessão
             session_query = self.supabase.table("sessions").select("id").eq("key", session_key).execute()
@@ -130,43 +242,63 @@ class WeatherDataProcessor(BaseProcessor):
         """
         Extract weather data from timestamped entries.
         
+        The values are collected column by column so the DataFrame can be
+        built without transposing a list of records.
+        
         Args:
             timestamped_data: List of tuples containing (timestamp, json_data)
             
         Returns:
-            list: List of dictionaries containing weather data
+            dict: Column name -> list of values (empty if no valid entries)
         """
-        weather_data = []
+        columns = {"timestamp": []}
+        count = 0
         
-        for i, (timestamp, json_str) in enumerate(timestamped_data):
+        for timestamp, json_str in timestamped_data:
             try:
                 # Parse the JSON data
-                data = json.loads(json_str)
-                
-                # Create a weather entry with the timestamp
-                weather_entry = data.copy()
-                weather_entry["timestamp"] = timestamp
-                
-                # Convert numeric values
-                for key in ["AirTemp", "Humidity", "Pressure", "Rainfall", "TrackTemp", "WindDirection", "WindSpeed"]:
-                    if key in weather_entry:
-                        try:
-                            weather_entry[key] = float(weather_entry[key])
-                        except (ValueError, TypeError):
-                            # Keep as string if conversion fails
-                            pass
-                
-                weather_data.append(weather_entry)
-                
-                # Progress reporting
-                if (i + 1) % 100 == 0:
-                    print(f"Processed {i+1} weather records...")
-                    
+                data = json_loads(json_str)
             except json.JSONDecodeError:
                 print(f"Error parsing JSON at timestamp {timestamp}")
                 continue
+            
+            for key, value in data.items():
+                if key == "timestamp":
+                    continue
+                column = columns.get(key)
+                if column is None:
+                    # New field: backfill the records that did not have it
+                    column = columns[key] = [None] * count
+                column.append(value)
+            
+            columns["timestamp"].append(timestamp)
+            count += 1
+            
+            # Fill fields missing from this record
+            for column in columns.values():
+                if len(column) < count:
+                    column.append(None)
+        
+        return columns if count else {}
+    
+    def create_weather_dataframe(self, weather_data):
+        """
+        Build the weather DataFrame and convert the numeric columns in bulk.
+        
+        Args:
+            weather_data: Column dictionary returned by extract_weather_data
+            
+        Returns:
+            pd.DataFrame: Weather data with timestamp as the first column
+        """
+        df_weather = pd.DataFrame(weather_data)
+        
+        # Values that cannot be converted become NaN
+        for col in NUMERIC_COLUMNS:
+            if col in df_weather.columns:
+                df_weather[col] = pd.to_numeric(df_weather[col], errors='coerce')
         
-        return weather_data
+        return self.ensure_timestamp_first(df_weather)
     
     def save_to_database(self, weather_data_df, session_id):
         """
@@ -184,78 +316,55 @@ class WeatherDataProcessor(BaseProcessor):
             return False
             
         try:
-            # Verificar registros existentes para esta sessão
-            print(f"Verificando registros existentes para a sessão ID: {session_id}")
-            existing_query = self.supabase.table("weather_data").select("id").eq("session_id", session_id)
-            existing_records = existing_query.execute()
-            
-            # Se já existem registros, remover automaticamente para evitar duplicações
-            if existing_records.data:
-                existing_count = len(existing_records.data)
-                print(f"ATENÇÃO: Encontrados {existing_count} registros existentes para esta sessão.")
-                print(f"Removendo registros existentes para evitar duplicação...")
-                self.supabase.table("weather_data").delete().eq("session_id", session_id).execute()
-                print(f"Removidos {existing_count} registros existentes.")
-            
-            # Preparar dados para inserção
-            db_records = []
-            
             # Criar uma coluna de timestamp em formato ISO
             session_date = datetime.now().strftime("%Y-%m-%d")
             
             print(f"Convertendo timestamps com data base: {session_date}")
             
-            for _, row in weather_data_df.iterrows():
-                # Converter o timestamp para formato ISO
-                time_part = row["timestamp"]  # formato: "00:00:17.964"
-                iso_timestamp = f"{session_date} {time_part}"
-                
-                # Converter valores numéricos para tipos corretos
-                air_temp = float(row.get("AirTemp")) if row.get("AirTemp") is not None else None
-                track_temp = float(row.get("TrackTemp")) if row.get("TrackTemp") is not None else None
-                humidity = float(row.get("Humidity")) if row.get("Humidity") is not None else None
-                pressure = float(row.get("Pressure")) if row.get("Pressure") is not None else None
-                rainfall = float(row.get("Rainfall")) if row.get("Rainfall") is not None else None
-                
-                try:
-                    wind_direction = int(float(row.get("WindDirection"))) if row.get("WindDirection") is not None else None
-                except (ValueError, TypeError):
-                    wind_direction = None
-                    
-                try:
-                    wind_speed = float(row.get("WindSpeed")) if row.get("WindSpeed") is not None else None
-                except (ValueError, TypeError):
-                    wind_speed = None
-                
-                # Criar registro para o banco SEM a coluna 'conditions'
-                db_record = {
-                    "session_id": session_id,
-                    "timestamp": iso_timestamp,
-                    "air_temp": air_temp,
-                    "track_temp": track_temp,
-                    "humidity": humidity,
-                    "pressure": pressure,
-                    "rainfall": rainfall,
-                    "wind_direction": wind_direction,
-                    "wind_speed": wind_speed
-                }
-                
-                db_records.append(db_record)
+            # Montar os registros coluna a coluna (conversões vetorizadas)
+            db_df = pd.DataFrame({
+                "session_id": session_id,
+                "timestamp": session_date + " " + weather_data_df["timestamp"].astype(str)  # formato: "00:00:17.964"
+            }, index=weather_data_df.index)
+            
+            for source_col, db_col in DATABASE_COLUMNS:
+                if source_col in weather_data_df.columns:
+                    db_df[db_col] = pd.to_numeric(weather_data_df[source_col], errors='coerce')
+                else:
+                    db_df[db_col] = np.nan
+            
+            # Direção do vento é inteira no banco
+            db_df["wind_direction"] = np.trunc(db_df["wind_direction"]).astype("Int64")
+            
+            # Valores ausentes vão para o banco como NULL
+            db_df = db_df.astype(object).where(db_df.notna(), None)
+            
+            # Com conexão direta, gravar tudo com COPY numa única transação
+            if self.db_connection is not None:
+                total_records = self._copy_weather_records(db_df, session_id)
+                print(f"Todos os {total_records} registros meteorológicos foram salvos no banco de dados via COPY.")
+                return True
+            
+            # Remover os registros existentes da sessão antes de inserir (uma única chamada)
+            print(f"Removendo registros existentes da sessão ID: {session_id}")
+            self.supabase.table("weather_data").delete().eq("session_id", session_id).execute()
+            
+            db_records = db_df.to_dict(orient="records")
             
             # Inserir em lotes para evitar problemas com tamanho da requisição
-            batch_size = 100
             total_records = len(db_records)
             
             # Mostrar exemplo do primeiro registro para verificação
             if db_records:
                 print(f"Exemplo de registro a ser inserido: {db_records[0]}")
             
-            for i in range(0, total_records, batch_size):
-                batch = db_records[i:i + batch_size]
-                self.supabase.table("weather_data").insert(batch).execute()
-                print(f"Inseridos registros {i+1} a {min(i + batch_size, total_records)} de {total_records}")
+            batches = [db_records[i:i + DATABASE_BATCH_SIZE] for i in range(0, total_records, DATABASE_BATCH_SIZE)]
+            
+            # Enviar os lotes em paralelo para sobrepor a latência HTTP
+            with ThreadPoolExecutor(max_workers=DATABASE_WORKERS) as executor:
+                inserted = sum(executor.map(self._insert_weather_batch, batches))
             
-            print(f"Todos os {total_records} registros meteorológicos foram salvos no banco de dados.")
+            print(f"Todos os {inserted} registros meteorológicos foram salvos no banco de dados ({len(batches)} lotes).")
             return True
             
         except Exception as e:
@@ -264,6 +373,44 @@ class WeatherDataProcessor(BaseProcessor):
                 print(f"Detalhe do erro: {e['message']}")
             return False
     
+    def _copy_weather_records(self, db_df, session_id):
+        """
+        Replace the session's weather records through the direct connection,
+        streaming the rows with COPY instead of REST batches.
+        
+        Args:
+            db_df: DataFrame with the weather_data table columns
+            session_id: ID of the session in the database
+            
+        Returns:
+            int: Number of records written
+        """
+        columns = ", ".join(db_df.columns)
+        with self.db_connection.transaction():
+            with self.db_connection.cursor() as cursor:
+                print(f"Removendo registros existentes da sessão ID: {session_id}")
+                cursor.execute("DELETE FROM weather_data WHERE session_id = %s", (session_id,))
+                with cursor.copy(f"COPY weather_data ({columns}) FROM STDIN WITH (FORMAT csv)") as copy:
+                    # Enviar o CSV bloco a bloco; campos vazios são carregados como NULL
+                    for start in range(0, len(db_df), COPY_CHUNK_ROWS):
+                        chunk = db_df.iloc[start:start + COPY_CHUNK_ROWS]
+                        copy.write(chunk.to_csv(header=False, index=False))
+        
+        return len(db_df)
+    
+    def _insert_weather_batch(self, batch):
+        """
+        Insert one batch of weather records.
+        
+        Args:
+            batch: List of record dictionaries
+            
+        Returns:
+            int: Number of records sent
+        """
+        self.supabase.table("weather_data").insert(batch).execute()
+        return len(batch)
+    
     def process(self, meeting_key, session_key, race_name=None, session_name=None):
         """
         Process WeatherData for a specific race and session.
@@ -309,12 +456,7 @@ class WeatherDataProcessor(BaseProcessor):
             return results
         
         # Create a DataFrame with the weather data
-        df_weather = pd.DataFrame(weather_data)
-        
-        # Reorder columns to make timestamp the first column
-        if 'timestamp' in df_weather.columns:
-            columns = ['timestamp'] + [col for col in df_weather.columns if col != 'timestamp']
-            df_weather = df_weather[columns]
+        df_weather = self.create_weather_dataframe(weather_data)
         
         # Save the processed data to CSV using key-based structure
         csv_path = self.save_to_csv(
@@ -328,6 +470,19 @@ class WeatherDataProcessor(BaseProcessor):
         )
         results["weather_data_file"] = csv_path
         
+        # Columnar copy for downstream readers
+        parquet_path = self.save_to_parquet(
+            df_weather,
+            meeting_key,
+            session_key,
+            self.topic_name,
+            "weather_data.parquet",
+            race_name,
+            session_name
+        )
+        if parquet_path:
+            results["weather_parquet_file"] = parquet_path
+        
         # Salvar no banco de dados
         if self.supabase:
             print("Preparando para salvar dados meteorológicos no banco...")
@@ -418,12 +573,7 @@ class WeatherDataProcessor(BaseProcessor):
                 return results
             
             # Create a DataFrame with the weather data
-            df_weather = pd.DataFrame(weather_data)
-            
-            # Reorder columns to make timestamp the first column
-            if 'timestamp' in df_weather.columns:
-                columns = ['timestamp'] + [col for col in df_weather.columns if col != 'timestamp']
-                df_weather = df_weather[columns]
+            df_weather = self.create_weather_dataframe(weather_data)
             
             # Save using legacy method
             output_dir = self.processed_dir / race_name / session_name / self.topic_name
@@ -493,5 +643,7 @@ if __name__ == "__main__":
         print("Erro: Você deve fornecer --meeting e --session (novo formato) ou --race e --session-name (formato legado)")
         exit(1)
     
+    processor.close()
+    
     print("\nProcessamento concluído!")
     print(f"Resultados: {results}")
\ No newline at end of file
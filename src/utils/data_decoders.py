@@ -2,9 +2,36 @@
 Functions for decoding compressed F1 data formats.
 """
 import base64
+import mmap
+import os
+import re
 import zlib
 import json
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library parser
+    orjson = None
+
+try:
+    import pybase64
+except ImportError:  # pybase64 is optional; fall back to the standard library decoder
+    pybase64 = None
+
+# JSON parser used for the feed payloads. orjson.JSONDecodeError subclasses
+# json.JSONDecodeError, so callers can keep catching the stdlib exception.
+json_loads = orjson.loads if orjson is not None else json.loads
+
+# Base64 decoder for the compressed .z payloads (SIMD-accelerated when available)
+b64decode = pybase64.b64decode if pybase64 is not None else base64.b64decode
+
+# Timestamp that starts each entry of a .jsonStream file
+TIMESTAMP_PATTERN = re.compile(r'\d{2}:\d{2}:\d{2}\.\d{3}')
+TIMESTAMP_PATTERN_BYTES = re.compile(rb'\d{2}:\d{2}:\d{2}\.\d{3}')
+
+# Padded standard base64, as used by the compressed .z payloads
+BASE64_PATTERN = re.compile(r'[A-Za-z0-9+/]*={0,2}')
+
 
 def decode_compressed_data(encoded_data):
     """
@@ -17,15 +44,19 @@ def decode_compressed_data(encoded_data):
         dict: The decoded data as a dictionary, or None if decoding failed
     """
     try:
-        # Remove quotes from the beginning and end if present
-        if encoded_data.startswith('"') and encoded_data.endswith('"'):
-            encoded_data = encoded_data[1:-1]
+        # Remove surrounding whitespace and quotes (never part of the base64 alphabet)
+        encoded_data = encoded_data.strip().strip('"')
+        
+        # Reject obviously malformed payloads before decoding them
+        if len(encoded_data) % 4 or not BASE64_PATTERN.fullmatch(encoded_data):
+            print("Error decoding compressed data: payload is not valid base64")
+            return None
         
-        # Decode base64 and decompress zlib
-        decoded_data = zlib.decompress(base64.b64decode(encoded_data), -zlib.MAX_WBITS)
+        # Decode base64 and decompress the raw deflate stream
+        decoded_data = zlib.decompress(b64decode(encoded_data), -zlib.MAX_WBITS)
         
         # Convert to JSON
-        return json.loads(decoded_data)
+        return json_loads(decoded_data)
     except Exception as e:
         print(f"Error decoding compressed data: {str(e)}")
         return None
@@ -35,19 +66,46 @@ def decode_json_stream(text):
     """
     Extract timestamped data from a JSON stream.
     
+    Each entry runs from its timestamp to the start of the next one, so the
+    stream is scanned once for timestamps and the payloads are sliced out.
+    
     Args:
-        text: The JSON stream text
+        text: The JSON stream text (str, bytes or a bytes-like buffer such as mmap)
         
-    Returns:
-        list: List of tuples containing (timestamp, data)
+    Yields:
+        tuple: (timestamp, data), as str for str input and bytes otherwise
     """
-    import re
+    pattern = TIMESTAMP_PATTERN if isinstance(text, str) else TIMESTAMP_PATTERN_BYTES
     
-    # Extract timestamp and data using regex
-    pattern = r'(\d{2}:\d{2}:\d{2}\.\d{3})(.*?)(?=\d{2}:\d{2}:\d{2}\.\d{3}|$)'
-    matches = re.findall(pattern, text, re.DOTALL)
+    previous = None
+    for match in pattern.finditer(text):
+        if previous is not None:
+            yield previous.group(), text[previous.end():match.start()]
+        previous = match
     
-    return matches
+    if previous is not None:
+        yield previous.group(), text[previous.end():]
+
+
+def iter_stream(file_path):
+    """
+    Memory-map a raw .jsonStream file and yield its timestamped entries,
+    so the file is never read into memory as a whole.
+    
+    Args:
+        file_path: Path to the raw data file
+        
+    Yields:
+        tuple: (timestamp, data) decoded as UTF-8 strings
+    """
+    with open(file_path, 'rb') as f:
+        # Empty files cannot be mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for timestamp, data in decode_json_stream(mm):
+                yield timestamp.decode('ascii'), data.decode('utf-8', errors='replace')
 
 
 def fix_utf8_bom(content):
@@ -1,6 +1,7 @@
 """
 File utility functions for the F1 Data Analyzer.
 """
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -19,6 +20,35 @@ def ensure_directory(directory_path):
     return directory
 
 
+@lru_cache(maxsize=512)
+def _list_directory(path_str, mtime_ns, kind):
+    """
+    List a directory once per modification time.
+    
+    The directory mtime is part of the cache key, so adding or removing an
+    entry invalidates the cached listing.
+    
+    Args:
+        path_str: Directory path as a string
+        mtime_ns: Modification time of the directory (st_mtime_ns)
+        kind: "dirs" for subdirectory names, "topics" for .jsonStream topics
+        
+    Returns:
+        tuple: The entry names
+    """
+    directory = Path(path_str)
+    
+    if kind == "topics":
+        return tuple(file_path.name.replace(".jsonStream", "") for file_path in directory.glob("*.jsonStream"))
+    
+    return tuple(d.name for d in directory.iterdir() if d.is_dir())
+
+
+def clear_directory_cache():
+    """Discard the cached directory listings."""
+    _list_directory.cache_clear()
+
+
 def get_available_races(data_dir):
     """
     Get a list of available races in the data directory.
@@ -33,7 +63,7 @@ def get_available_races(data_dir):
     if not data_path.exists():
         return []
     
-    return [d.name for d in data_path.iterdir() if d.is_dir()]
+    return list(_list_directory(str(data_path), data_path.stat().st_mtime_ns, "dirs"))
 
 
 def get_available_sessions(data_dir, race_name):
@@ -51,7 +81,7 @@ def get_available_sessions(data_dir, race_name):
     if not race_path.exists():
         return []
     
-    return [d.name for d in race_path.iterdir() if d.is_dir()]
+    return list(_list_directory(str(race_path), race_path.stat().st_mtime_ns, "dirs"))
 
 
 def get_available_topics(data_dir, race_name, session_name):
@@ -70,9 +100,4 @@ def get_available_topics(data_dir, race_name, session_name):
     if not session_path.exists():
         return []
     
-    topics = []
-    for file_path in session_path.glob("*.jsonStream"):
-        topic = file_path.name.replace(".jsonStream", "")
-        topics.append(topic)
-    
-    return topics
\ No newline at end of file
+    return list(_list_directory(str(session_path), session_path.stat().st_mtime_ns, "topics"))
\ No newline at end of file
@@ -55,6 +55,20 @@ def timestamp_to_datetime(timestamp):
         return None
 
 
+def timestamps_to_datetime(timestamps):
+    """
+    Convert a Series of timestamp strings (HH:MM:SS.mmm) to datetimes.
+    Vectorized counterpart of timestamp_to_datetime (same 1900-01-01 date).
+    
+    Args:
+        timestamps: pandas Series with the timestamp strings
+        
+    Returns:
+        pd.Series: The datetimes (NaT where parsing failed)
+    """
+    return pd.to_datetime(timestamps.astype(str).str.strip(), format="%H:%M:%S.%f", cache=True, errors='coerce')
+
+
 def format_time_delta(seconds):
     """
     Format a time delta in seconds to a readable string.